@@ -1,13 +1,12 @@
 """Firetail - An EVE Online Discord Bot"""
 
 import argparse
-import asyncio
 import sys
 
 import discord
 
 from firetail.core import bot, events
-from firetail.utils import ExitCodes, logger
+from firetail.utils import ExitCodes, logger, runtime
 
 if discord.version_info.major < 1:
     print("You are not running discord.py v1.0.0a or above.\n\n"
@@ -16,8 +15,21 @@ if discord.version_info.major < 1:
     sys.exit(1)
 
 
-def run_firetail(debug=None, launcher=None):
+def config_option(name, default=None):
+    try:
+        return getattr(bot.config, name)
+    except AttributeError:
+        return default
+
+
+def run_firetail(debug=None, launcher=None, event_loop=None, loop_debug=None, gc_threshold=None):
+    event_loop = runtime.install_loop(event_loop or config_option('event_loop', 'asyncio'))
+    gc_threshold = gc_threshold or config_option('gc_threshold')
+    if gc_threshold:
+        runtime.tune_gc(gc_threshold)
     firetail = bot.Firetail(debug=debug)
+    if loop_debug or config_option('loop_debug', False):
+        runtime.set_debug(firetail.loop, True)
     events.init_events(firetail, launcher=launcher)
     firetail.logger = logger.init_logger(debug_flag=debug)
     firetail.load_extension('firetail.core.commands')
@@ -25,7 +37,8 @@ def run_firetail(debug=None, launcher=None):
     for ext in firetail.preload_ext:
         ext_name = ("firetail.extensions." + ext)
         firetail.load_extension(ext_name)
-    loop = asyncio.get_event_loop()
+    firetail.logger.info(f"Running on the {event_loop} event loop.")
+    loop = firetail.loop
     if firetail.token is None or not firetail.default_prefix:
         firetail.logger.critical("Token and prefix must be set in order to login.")
         sys.exit(1)
@@ -54,12 +67,20 @@ def parse_cli_args():
         "--debug", "-d", help="Enabled debug mode.", action="store_true")
     parser.add_argument(
         "--launcher", "-l", help=argparse.SUPPRESS, action="store_true")
+    parser.add_argument(
+        "--loop", help="Event loop implementation, overriding the config.", choices=runtime.LOOPS)
+    parser.add_argument(
+        "--loop-debug", help="Enable asyncio debug mode.", action="store_true")
+    parser.add_argument(
+        "--gc-threshold", help="Garbage collector thresholds, overriding the config.",
+        type=int, nargs="+", metavar="N")
     return parser.parse_args()
 
 
 def main():
     args = parse_cli_args()
-    run_firetail(debug=args.debug, launcher=args.launcher)
+    run_firetail(debug=args.debug, launcher=args.launcher, event_loop=args.loop,
+                 loop_debug=args.loop_debug, gc_threshold=args.gc_threshold)
 
 
 if __name__ == '__main__':
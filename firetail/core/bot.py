@@ -1,3 +1,5 @@
+import asyncio
+import logging
 import os
 import sys
 from collections import Counter
@@ -9,7 +11,12 @@ import discord
 from dateutil.relativedelta import relativedelta
 from discord.ext import commands
 
-from firetail.lib import ESI, db
+from firetail.core.entities import EntityIndex
+from firetail.core.loop_monitor import THRESHOLD, LoopMonitor
+from firetail.core.metrics import Metrics
+from firetail.lib import ESI, SDE, DiskCache, KillmailStore, Market, Resolver, ZKill, codec, db
+from firetail.lib.jumps import JumpMap
+from firetail.lib.sde import gate_graph, location_index, type_index
 from firetail.utils import ExitCodes
 
 # Lets check the config file exists before we continue..
@@ -26,6 +33,8 @@ if os.getenv("CONFIG") is not None:
 else:
     from firetail import config
 
+log = logging.getLogger(__name__)
+
 
 async def prefix_manager(bot, message):
     if not message.guild:
@@ -57,16 +66,109 @@ class Firetail(commands.Bot):
         # kwargs["command_prefix"] = self.db.prefix_manager
         kwargs["owner_id"] = self.owner
         super().__init__(**kwargs)
-        self.session = aiohttp.ClientSession(loop=self.loop)
-        self.esi_data = ESI(self.session)
+        self.metrics = Metrics(self)
+        try:
+            threshold = config.loop_block_threshold
+        except AttributeError:
+            threshold = THRESHOLD
+        self.loop_monitor = LoopMonitor(self.loop, self.metrics, threshold=threshold)
+        self.loop_monitor.start()
+        self.session = aiohttp.ClientSession(
+            loop=self.loop, json_serialize=codec.dumps, trace_configs=[self.metrics.trace_config()]
+        )
+        self.esi_cache = DiskCache()
+        self.esi_cache.purge()
+        self.esi_data = ESI(self.session, self.esi_cache)
+        self.market = Market(self.esi_data)
+        self.resolver = Resolver(self.esi_data)
+        self.killmails = KillmailStore(self.session)
+        self.zkill = ZKill(self.session)
+        self.sde = SDE(self.session, self.esi_data)
+        self.types = None
+        self.locations = None
+        self.jumps = None
+        self.gates = None
+        self.sde_ready = asyncio.Event()
+        self.entities = EntityIndex(self)
+        self.add_gauges()
         self.loop.create_task(self.load_db())
+        self.loop.create_task(self.load_sde())
+        self.loop.create_task(self.start_metrics())
         self.debug = bool(kwargs["debug"])
 
+    def add_gauges(self):
+        gauge = self.metrics.gauge
+        gauge('firetail_guilds', lambda: len(self.guilds))
+        gauge('firetail_loop_stalls', lambda: self.loop_monitor.stalls)
+        gauge('firetail_esi_disk_cache_hits', lambda: self.esi_cache.hits)
+        gauge('firetail_esi_disk_cache_misses', lambda: self.esi_cache.misses)
+        gauge('firetail_killmail_store_entries', lambda: len(self.killmails))
+        gauge('firetail_market_cache_entries', lambda: len(self.market))
+        gauge('firetail_resolver_cache_entries', lambda: len(self.resolver))
+        gauge('firetail_zkill_cache_entries', lambda: len(self.zkill))
+        gauge('firetail_zkill_cache_hits', lambda: self.zkill.hits)
+        gauge('firetail_zkill_requests', lambda: self.zkill.requests)
+        gauge('firetail_zkill_pending_requests', lambda: self.zkill.pending)
+
+    def set_esi(self, esi):
+        """Switch everything holding the ESI client over to `esi`."""
+        self.esi_data = esi
+        self.market.esi = esi
+        self.resolver.esi = esi
+        self.sde.esi = esi
+
+    async def start_metrics(self):
+        """Serve Prometheus metrics locally if a ``metrics_port`` is configured."""
+        try:
+            port = config.metrics_port
+        except AttributeError:
+            port = None
+        if not port:
+            return
+        try:
+            await self.metrics.start_server(port)
+        except OSError:
+            log.exception(f'Unable to serve metrics on port {port}.')
+
     async def load_db(self):
         await db.create_tables()
         data = await db.select("SELECT * FROM prefixes")
         self.prefixes = dict(data)
 
+    async def load_sde(self):
+        """Load the local name indexes, lookups use ESI until this is done.
+
+        `sde_ready` is set once loading has finished, even if it failed,
+        so anything waiting on it must check the indexes it needs.
+        """
+        try:
+            await self.sde.update()
+        except Exception:
+            log.exception('Unable to load the SDE snapshot, falling back to ESI lookups.')
+            self.sde_ready.set()
+            return
+
+        self.types = await self.build_sde('type index', self.sde.build, type_index)
+        if self.types is not None:
+            self.market.types = self.types
+            log.info(f'Loaded {len(self.types)} types from SDE version {self.sde.version}.')
+        self.locations = await self.build_sde('location index', self.sde.build, location_index)
+        if self.locations is not None:
+            log.info(f'Loaded {len(self.locations)} locations from SDE version {self.sde.version}.')
+            locations = [location for _, location in self.locations.items()]
+            self.jumps = await self.build_sde('jump map', self.loop.run_in_executor, None, JumpMap, locations)
+        self.gates = await self.build_sde('gate graph', self.sde.build, gate_graph)
+        self.sde_ready.set()
+
+    @staticmethod
+    async def build_sde(name, build, *args):
+        """Build one SDE index, or None if it fails so the others are still usable."""
+        try:
+            return await build(*args)
+        except Exception:
+            log.exception(f'Unable to build the {name} from the SDE, falling back to ESI where possible.')
+            return None
+
     async def shutdown(self, *, restart=False):
         """Shutdown the bot.
         Safely ends the bot connection while passing the exit code based
@@ -76,6 +178,7 @@ class Firetail(commands.Bot):
             self._shutdown_mode = ExitCodes.SHUTDOWN
         else:
             self._shutdown_mode = ExitCodes.RESTART
+        self.loop_monitor.stop()
         await self.logout()
 
     @discord.utils.cached_property
@@ -366,6 +366,36 @@ class Core(commands.Cog):
         except discord.errors.Forbidden:
             await ctx.author.send(embed=embed)
 
+    @get_.command(name="metrics")
+    @checks.is_owner()
+    async def get_metrics(self, ctx):
+        """Show command, outbound request and event loop latency, and cache sizes."""
+
+        metrics = self.bot.metrics
+        sections = []
+        for title, name, label in (
+            ('Commands', 'firetail_command_seconds', 'command'),
+            ('Hosts', 'firetail_http_request_seconds', 'host'),
+        ):
+            rows = metrics.summary(name, label)
+            if not rows:
+                continue
+            width = max(len(str(row[0])) for row in rows)
+            lines = [f"{title:<{width}}  {'count':>7}  {'p50':>8}  {'p95':>8}  {'p99':>8}"]
+            for value, count, *quantiles in rows:
+                times = '  '.join(f'{q * 1000:>6.0f}ms' for q in quantiles)
+                lines.append(f'{value:<{width}}  {count:>7,}  {times}')
+            sections.append('\n'.join(lines))
+        lag = self.bot.loop_monitor.quantiles(0.5, 0.95, 0.99, 1)
+        if lag:
+            times = '  '.join(f'{q * 1000:.1f}ms' for q in lag)
+            sections.append(f'Loop lag p50/p95/p99/max  {times}')
+        gauges = metrics.read_gauges()
+        if gauges:
+            width = max(len(name) for name in gauges)
+            sections.append('\n'.join(f'{name:<{width}}  {value:,}' for name, value in sorted(gauges.items())))
+        await ctx.codeblock('\n\n'.join(sections) or 'No metrics recorded yet.', syntax='', title='Metrics')
+
     @get_.command()
     @checks.spam_check()
     async def resumes(self, ctx):
@@ -241,6 +241,30 @@ class GetTools:
     def __call__(self, iterable, **attrs):
         return self.get(iterable, **attrs)
 
+    @staticmethod
+    def _lookup(table, search_term, getter, kind=None):
+        """Find an object through a name table of the bot's entity index.
+
+        Exact matches are preferred, then case-insensitive ones, then a
+        unique prefix, each only counting objects of type `kind` if it's
+        given. If several objects share a name, one whose ``name``
+        matches exactly wins over a nickname or full name.
+        """
+        if table is None:
+            return None
+        where = None
+        if kind is not None:
+            def where(item_id):
+                return isinstance(getter(item_id), kind)
+        found = [obj for obj in map(getter, table.find(search_term, where)) if obj is not None]
+        for obj in found:
+            if obj.name == search_term:
+                return obj
+        return found[0] if found else None
+
+    def _tables(self, guild):
+        return self.ctx.bot.entities.guild(guild.id)
+
     async def user(self, search_term):
         """Get a user by ID or name.
         If an ID is provided, it will return a user even if they don't share a
@@ -266,11 +290,7 @@ class GetTools:
             else:
                 return user
         if isinstance(search_term, str):
-            member = self.get(bot.users, name=search_term)
-            if not member:
-                members = {str(m): m for m in bot.users}
-                member = members.get(search_term, None)
-            return member
+            return self._lookup(bot.entities.users, search_term, bot.get_user)
 
     async def message(self, id, channel=None, guild=None, no_cache=False):
         """Get a message from the current or specified channels.
@@ -331,7 +351,8 @@ class GetTools:
         if isinstance(search_term, int):
             return guild.get_channel(search_term)
         if isinstance(search_term, str):
-            return self.get(guild.channels, name=search_term)
+            tables = self._tables(guild)
+            return self._lookup(tables and tables.channels, search_term, guild.get_channel)
 
     def text_channel(self, search_term, guild=None):
         """Get a text channel from the current or specified guild.
@@ -360,7 +381,8 @@ class GetTools:
                 return channel
             return None
         if isinstance(search_term, str):
-            return self.get(guild.text_channels, name=search_term)
+            tables = self._tables(guild)
+            return self._lookup(tables and tables.channels, search_term, guild.get_channel, discord.TextChannel)
 
     def voice_channel(self, search_term, guild=None):
         """Get a voice channel from the current or specified guild.
@@ -384,9 +406,13 @@ class GetTools:
         if not guild:
             return None
         if isinstance(search_term, int):
-            return self.get(guild.voice_channels, id=search_term)
+            channel = guild.get_channel(search_term)
+            if isinstance(channel, discord.VoiceChannel):
+                return channel
+            return None
         if isinstance(search_term, str):
-            return self.get(guild.voice_channels, name=search_term)
+            tables = self._tables(guild)
+            return self._lookup(tables and tables.channels, search_term, guild.get_channel, discord.VoiceChannel)
 
     def category(self, search_term, guild=None):
         """Get a channel category from the current or specified guild.
@@ -410,9 +436,13 @@ class GetTools:
         if not guild:
             return None
         if isinstance(search_term, int):
-            return self.get(guild.categories, id=search_term)
+            channel = guild.get_channel(search_term)
+            if isinstance(channel, discord.CategoryChannel):
+                return channel
+            return None
         if isinstance(search_term, str):
-            return self.get(guild.categories, name=search_term)
+            tables = self._tables(guild)
+            return self._lookup(tables and tables.channels, search_term, guild.get_channel, discord.CategoryChannel)
 
     def member(self, search_term, guild=None):
         """Get a member from the current or specified guild.
@@ -438,13 +468,8 @@ class GetTools:
         if isinstance(search_term, int):
             return guild.get_member(search_term)
         if isinstance(search_term, str):
-            member = self.get(guild.members, name=search_term)
-            if not member:
-                member = self.get(guild.members, nick=search_term)
-            if not member:
-                members = {str(m): m for m in guild.members}
-                member = members.get(search_term, None)
-            return member
+            tables = self._tables(guild)
+            return self._lookup(tables and tables.members, search_term, guild.get_member)
 
     def role(self, search_term, guild=None):
         """Get a role from the current or specified guild.
@@ -468,9 +493,10 @@ class GetTools:
         if not guild:
             return None
         if isinstance(search_term, int):
-            return self.get(guild.roles, id=search_term)
+            return guild.get_role(search_term)
         if isinstance(search_term, str):
-            return self.get(guild.roles, name=search_term)
+            tables = self._tables(guild)
+            return self._lookup(tables and tables.roles, search_term, guild.get_role)
 
     def guild(self, search_term):
         """Get a guild by ID or fuzzymatched name.
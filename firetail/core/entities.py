@@ -0,0 +1,268 @@
+from bisect import bisect_left, insort
+
+
+def user_names(user):
+    return user.name, str(user)
+
+
+def member_names(member):
+    return member.name, member.nick, str(member)
+
+
+class NameTable:
+    """Ids by name, with exact, case-insensitive and prefix lookups.
+
+    Exact names map to an id, or to a set of ids for the names that are
+    shared. Case-folded names are kept in a sorted list of
+    ``(name, id)`` pairs, searched with bisect for case-insensitive and
+    prefix matches.
+    """
+
+    __slots__ = ('exact', 'keys')
+
+    def __init__(self):
+        self.exact = {}
+        self.keys = []
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _put(self, name, item_id):
+        ids = self.exact.get(name)
+        if ids is None:
+            self.exact[name] = item_id
+        elif isinstance(ids, set):
+            ids.add(item_id)
+        elif ids != item_id:
+            self.exact[name] = {ids, item_id}
+
+    def _take(self, name, item_id):
+        ids = self.exact.get(name)
+        if ids == item_id:
+            del self.exact[name]
+        elif isinstance(ids, set):
+            ids.discard(item_id)
+            if len(ids) == 1:
+                self.exact[name] = ids.pop()
+
+    def _has(self, key):
+        keys = self.keys
+        i = bisect_left(keys, key)
+        return i < len(keys) and keys[i] == key
+
+    def add(self, item_id, names):
+        keys = self.keys
+        for name in names:
+            if not name:
+                continue
+            self._put(name, item_id)
+            key = name.casefold(), item_id
+            i = bisect_left(keys, key)
+            if i == len(keys) or keys[i] != key:
+                keys.insert(i, key)
+
+    def add_many(self, items):
+        """Add ``(id, names)`` pairs, sorting the keys once at the end.
+
+        Keys already in the table are skipped, so adding the same items
+        again changes nothing.
+        """
+        new = set()
+        for item_id, names in items:
+            for name in names:
+                if name:
+                    new.add((name.casefold(), item_id))
+                    self._put(name, item_id)
+        keys = self.keys
+        if keys:
+            new = [key for key in new if not self._has(key)]
+        if len(new) * 256 < len(keys):
+            # a few inserts are cheaper than sorting the whole list again
+            for key in new:
+                insort(keys, key)
+        elif new:
+            keys.extend(new)
+            keys.sort()
+
+    def remove(self, item_id, names):
+        """Remove an item under all of its `names` at once."""
+        keys = self.keys
+        for name in names:
+            if not name:
+                continue
+            self._take(name, item_id)
+            key = name.casefold(), item_id
+            i = bisect_left(keys, key)
+            while i < len(keys) and keys[i] == key:
+                del keys[i]
+
+    def update(self, item_id, old_names, new_names):
+        old_names = tuple(old_names)
+        new_names = tuple(new_names)
+        if old_names != new_names:
+            self.remove(item_id, old_names)
+            self.add(item_id, new_names)
+
+    def folded(self, term, where=None):
+        """Ids with a name equal to `term`, ignoring case.
+
+        With `where`, only ids it returns True for are included.
+        """
+        key = term.casefold()
+        keys = self.keys
+        found = []
+        for i in range(bisect_left(keys, (key,)), len(keys)):
+            name, item_id = keys[i]
+            if name != key:
+                break
+            if where is None or where(item_id):
+                found.append(item_id)
+        return found
+
+    def prefix(self, term, limit=None, where=None):
+        """Ids with a name starting with `term`, ignoring case, in name order."""
+        key = term.casefold()
+        keys = self.keys
+        found = []
+        for i in range(bisect_left(keys, (key,)), len(keys)):
+            name, item_id = keys[i]
+            if not name.startswith(key) or (limit is not None and len(found) >= limit):
+                break
+            if item_id not in found and (where is None or where(item_id)):
+                found.append(item_id)
+        return found
+
+    def find(self, term, where=None):
+        """Ids matching `term` exactly, else ignoring case, else by a unique prefix.
+
+        With `where`, ids it returns False for are left out of every
+        tier, so a later tier can still match.
+        """
+        ids = self.exact.get(term)
+        if ids is not None:
+            found = list(ids) if isinstance(ids, set) else [ids]
+            if where is not None:
+                found = [item_id for item_id in found if where(item_id)]
+            if found:
+                return found
+        found = self.folded(term, where)
+        if found:
+            return found
+        found = self.prefix(term, limit=2, where=where)
+        return found if len(found) == 1 else []
+
+
+class GuildTables:
+    __slots__ = ('members', 'channels', 'roles')
+
+    def __init__(self, guild):
+        self.members = NameTable()
+        self.channels = NameTable()
+        self.roles = NameTable()
+        self.members.add_many((member.id, member_names(member)) for member in guild.members)
+        self.channels.add_many((channel.id, (channel.name,)) for channel in guild.channels)
+        self.roles.add_many((role.id, (role.name,)) for role in guild.roles)
+
+
+class EntityIndex:
+    """Name lookups for users, and for members, channels and roles per guild.
+
+    Built when the bot is ready and kept up to date from gateway events,
+    so lookups never scan the bot's caches. Only ids are stored, the
+    objects themselves come from the usual getters.
+    """
+
+    EVENTS = (
+        'on_ready', 'on_guild_join', 'on_guild_available', 'on_guild_remove', 'on_guild_unavailable',
+        'on_member_join', 'on_member_remove', 'on_member_update', 'on_user_update',
+        'on_guild_channel_create', 'on_guild_channel_delete', 'on_guild_channel_update',
+        'on_guild_role_create', 'on_guild_role_delete', 'on_guild_role_update',
+    )
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.users = NameTable()
+        self.guilds = {}
+        for event in self.EVENTS:
+            bot.add_listener(getattr(self, event), event)
+
+    def guild(self, guild_id):
+        """The `GuildTables` for a guild, or None if it isn't indexed."""
+        return self.guilds.get(guild_id)
+
+    def rebuild(self):
+        self.users = NameTable()
+        self.users.add_many((user.id, user_names(user)) for user in self.bot.users)
+        self.guilds = {guild.id: GuildTables(guild) for guild in self.bot.guilds}
+
+    async def on_ready(self):
+        self.rebuild()
+
+    async def on_guild_join(self, guild):
+        self.guilds[guild.id] = GuildTables(guild)
+        self.users.add_many((member.id, user_names(member)) for member in guild.members)
+
+    async def on_guild_available(self, guild):
+        # guilds becoming available while connecting are indexed by on_ready
+        if self.bot.is_ready():
+            await self.on_guild_join(guild)
+
+    async def on_guild_remove(self, guild):
+        self.guilds.pop(guild.id, None)
+
+    on_guild_unavailable = on_guild_remove
+
+    async def on_member_join(self, member):
+        tables = self.guilds.get(member.guild.id)
+        if tables is not None:
+            tables.members.add(member.id, member_names(member))
+        self.users.add(member.id, user_names(member))
+
+    async def on_member_remove(self, member):
+        tables = self.guilds.get(member.guild.id)
+        if tables is not None:
+            tables.members.remove(member.id, member_names(member))
+
+    async def on_member_update(self, before, after):
+        tables = self.guilds.get(after.guild.id)
+        if tables is not None:
+            tables.members.update(after.id, member_names(before), member_names(after))
+        self.users.update(after.id, user_names(before), user_names(after))
+
+    async def on_user_update(self, before, after):
+        self.users.update(after.id, user_names(before), user_names(after))
+        for guild in self.bot.guilds:
+            tables = self.guilds.get(guild.id)
+            member = guild.get_member(after.id)
+            if tables is not None and member is not None:
+                tables.members.update(after.id, (before.name, member.nick, str(before)), member_names(member))
+
+    async def on_guild_channel_create(self, channel):
+        tables = self.guilds.get(channel.guild.id)
+        if tables is not None:
+            tables.channels.add(channel.id, (channel.name,))
+
+    async def on_guild_channel_delete(self, channel):
+        tables = self.guilds.get(channel.guild.id)
+        if tables is not None:
+            tables.channels.remove(channel.id, (channel.name,))
+
+    async def on_guild_channel_update(self, before, after):
+        tables = self.guilds.get(after.guild.id)
+        if tables is not None:
+            tables.channels.update(after.id, (before.name,), (after.name,))
+
+    async def on_guild_role_create(self, role):
+        tables = self.guilds.get(role.guild.id)
+        if tables is not None:
+            tables.roles.add(role.id, (role.name,))
+
+    async def on_guild_role_delete(self, role):
+        tables = self.guilds.get(role.guild.id)
+        if tables is not None:
+            tables.roles.remove(role.id, (role.name,))
+
+    async def on_guild_role_update(self, before, after):
+        tables = self.guilds.get(after.guild.id)
+        if tables is not None:
+            tables.roles.update(after.id, (before.name,), (after.name,))
@@ -141,7 +141,7 @@ class ExtensionManager(commands.Cog):
             tb = "\n".join(traceback.format_tb(e.__traceback__))
             await ctx.codeblock(tb, title="Exception on loading ESI")
         else:
-            ctx.bot.esi_data = esi.ESI(ctx.bot.session)
+            ctx.bot.set_esi(esi.ESI(ctx.bot.session, ctx.bot.esi_cache))
             await ctx.success("ESI Reloaded")
 
 
@@ -0,0 +1,93 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+
+log = logging.getLogger(__name__)
+
+INTERVAL = 0.25  # seconds between samples
+THRESHOLD = 0.25  # seconds the loop can be late before it's reported as blocked
+WINDOW = 2400  # samples kept for percentiles, ten minutes at the default interval
+
+_current_task = getattr(asyncio, 'current_task', None) or asyncio.Task.current_task
+
+
+class LoopMonitor:
+    """Measures event loop lag and reports what's blocking the loop.
+
+    A task sleeps for `interval` seconds at a time and records how late
+    it wakes up, which is how long anything else scheduled on the loop
+    was kept waiting too. A watchdog thread checks the task keeps waking
+    up; once it's late by more than `threshold` a callback is blocking
+    the loop, and the loop thread's stack and current task are logged
+    while it's still stuck.
+    """
+
+    def __init__(self, loop, metrics=None, interval=INTERVAL, threshold=THRESHOLD, window=WINDOW):
+        self.loop = loop
+        self.metrics = metrics
+        self.interval = interval
+        self.threshold = threshold
+        self.samples = deque(maxlen=window)
+        self.stalls = 0
+        self._beat = None
+        self._thread_id = None
+        self._task = None
+        self._stopped = threading.Event()
+
+    def start(self):
+        if self._task is None:
+            self._task = self.loop.create_task(self.sample_loop())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._stopped.set()
+
+    def quantiles(self, *qs):
+        """Lag in seconds at each quantile of the recent samples, or None without samples."""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return [ordered[min(int(q * len(ordered)), len(ordered) - 1)] for q in qs]
+
+    async def sample_loop(self):
+        self._thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stopped.clear()
+        threading.Thread(target=self.watch, name='loop-watchdog', daemon=True).start()
+        try:
+            while True:
+                start = time.monotonic()
+                await asyncio.sleep(self.interval)
+                self._beat = time.monotonic()
+                lag = max(self._beat - start - self.interval, 0)
+                self.samples.append(lag)
+                if self.metrics is not None:
+                    self.metrics.observe('firetail_loop_lag_seconds', lag)
+                if lag > self.threshold:
+                    log.warning(f'Event loop was blocked for {lag:.3f}s.')
+        finally:
+            self._stopped.set()
+
+    def watch(self):
+        """Watchdog thread, reporting each stall once while it's happening."""
+        reported = None
+        while not self._stopped.wait(self.threshold / 2):
+            beat = self._beat
+            late = time.monotonic() - beat - self.interval
+            if late > self.threshold and beat != reported:
+                reported = beat
+                self.stalls += 1
+                self.report(late)
+
+    def report(self, late):
+        frame = sys._current_frames().get(self._thread_id)
+        stack = ''.join(traceback.format_stack(frame)) if frame is not None else ''
+        task = _current_task(self.loop)
+        running = repr(task) if task is not None else 'a callback outside of any task'
+        log.warning(f'Event loop blocked for {late:.3f}s so far, running {running}:\n{stack}')
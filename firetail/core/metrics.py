@@ -0,0 +1,189 @@
+import logging
+import time
+from bisect import bisect_left
+from types import SimpleNamespace
+
+import aiohttp
+from aiohttp import web
+
+log = logging.getLogger(__name__)
+
+# upper bounds in seconds, roughly 2.5x apart
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 60)
+
+
+class Histogram:
+    """Counts of observed values by bucket, as in Prometheus."""
+
+    __slots__ = ('counts', 'count', 'sum')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """Estimate of the `q` quantile, interpolated within its bucket."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if seen + count >= rank and count:
+                lower = BUCKETS[i - 1] if i else 0
+                upper = BUCKETS[i] if i < len(BUCKETS) else BUCKETS[-1]
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return BUCKETS[-1]
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join('{}="{}"'.format(k, str(v).replace('"', '\\"')) for k, v in labels) + '}'
+
+
+class Metrics:
+    """Latency histograms and gauges for the bot.
+
+    Command latency comes from the command events and outbound HTTP
+    latency from a trace config on the shared session, which costs a
+    timer and a bisect per observation. Gauges are functions that are
+    only called when the metrics are read, so queue and cache sizes
+    cost nothing until then.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.histograms = {}
+        self.gauges = {}
+        self.server = None
+        for event in ('on_command', 'on_command_completion', 'on_command_error'):
+            bot.add_listener(getattr(self, event), event)
+
+    def observe(self, name, value, **labels):
+        key = name, tuple(sorted(labels.items()))
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram()
+        histogram.observe(value)
+
+    def gauge(self, name, func):
+        """Report the value returned by `func` as gauge `name`."""
+        self.gauges[name] = func
+
+    def remove_gauge(self, name):
+        self.gauges.pop(name, None)
+
+    def read_gauges(self):
+        values = {}
+        for name, func in self.gauges.items():
+            try:
+                values[name] = func()
+            except Exception:
+                log.exception(f'Unable to read gauge {name}')
+        return values
+
+    # Commands
+
+    async def on_command(self, ctx):
+        ctx.started = time.perf_counter()
+
+    def _command_finished(self, ctx, outcome):
+        started = getattr(ctx, 'started', None)
+        if started is None or ctx.command is None:
+            return
+        self.observe('firetail_command_seconds', time.perf_counter() - started,
+                     command=ctx.command.qualified_name, outcome=outcome)
+
+    async def on_command_completion(self, ctx):
+        self._command_finished(ctx, 'ok')
+
+    async def on_command_error(self, ctx, error):
+        self._command_finished(ctx, 'error')
+
+    # HTTP
+
+    def trace_config(self):
+        """Trace config recording the latency of requests by host."""
+        config = aiohttp.TraceConfig(trace_config_ctx_factory=SimpleNamespace)
+
+        async def on_request_start(session, context, params):
+            context.started = time.perf_counter()
+
+        async def on_request_end(session, context, params):
+            self.observe('firetail_http_request_seconds', time.perf_counter() - context.started,
+                         host=params.url.host, status=str(params.response.status))
+
+        async def on_request_exception(session, context, params):
+            self.observe('firetail_http_request_seconds', time.perf_counter() - context.started,
+                         host=params.url.host, status='error')
+
+        config.on_request_start.append(on_request_start)
+        config.on_request_end.append(on_request_end)
+        config.on_request_exception.append(on_request_exception)
+        return config
+
+    # Exposition
+
+    def render(self):
+        """All metrics in the Prometheus text format."""
+        lines = []
+        described = set()
+        for (name, labels), histogram in sorted(self.histograms.items()):
+            if name not in described:
+                lines.append(f'# TYPE {name} histogram')
+                described.add(name)
+            cumulative = 0
+            for bound, count in zip(BUCKETS + ('+Inf',), histogram.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{_labels(labels + (("le", bound),))} {cumulative}')
+            lines.append(f'{name}_sum{_labels(labels)} {histogram.sum}')
+            lines.append(f'{name}_count{_labels(labels)} {histogram.count}')
+        for name, value in sorted(self.read_gauges().items()):
+            lines.append(f'# TYPE {name} gauge')
+            lines.append(f'{name} {value}')
+        for name, value in sorted(self.bot.counter.items()):
+            lines.append(f'# TYPE firetail_{name}_total counter')
+            lines.append(f'firetail_{name}_total {value}')
+        return '\n'.join(lines) + '\n'
+
+    def summary(self, name, label, limit=15):
+        """Rows of ``(label value, count, p50, p95, p99)`` for a histogram, slowest p95 first."""
+        merged = {}
+        for (metric, labels), histogram in self.histograms.items():
+            if metric != name:
+                continue
+            value = dict(labels)[label]
+            total = merged.setdefault(value, Histogram())
+            total.counts = [a + b for a, b in zip(total.counts, histogram.counts)]
+            total.count += histogram.count
+            total.sum += histogram.sum
+        rows = [
+            (value, h.count, h.quantile(0.5), h.quantile(0.95), h.quantile(0.99))
+            for value, h in merged.items()
+        ]
+        rows.sort(key=lambda row: row[3], reverse=True)
+        return rows[:limit]
+
+    async def start_server(self, port, host='127.0.0.1'):
+        """Serve the metrics at ``/metrics`` for Prometheus to scrape."""
+        async def handle(request):
+            return web.Response(text=self.render(), content_type='text/plain', charset='utf-8')
+
+        app = web.Application()
+        app.router.add_get('/metrics', handle)
+        self.server = web.AppRunner(app)
+        await self.server.setup()
+        await web.TCPSite(self.server, host, port).start()
+        log.info(f'Serving metrics on http://{host}:{port}/metrics')
+
+    async def stop_server(self):
+        if self.server is not None:
+            await self.server.cleanup()
+            self.server = None
@@ -23,6 +23,7 @@ preload_extensions = [
     'killmail',             # Killmail posting extension
     'location_scout',       # Provides intel on systems/constellations/regions
     'price',                # Price check extension
+    'route_planner',        # Gate routes between systems
     'sov_tracker',          # Provides real time info on sov fights
 
     # still in testing, use at your own risk
@@ -39,6 +40,20 @@ preload_extensions = [
     # 'fleet_up',             # Shares upcoming fleet-up operations
 ]
 
+# serve Prometheus metrics at http://127.0.0.1:<port>/metrics
+# metrics_port = 9100
+# log the stack of anything blocking the event loop for longer than this many seconds
+# loop_block_threshold = 0.25
+# where the profile command saves profiles
+# profile_dir = 'profiles'
+
+# event loop implementation, 'asyncio' or 'uvloop' if it's installed
+event_loop = 'asyncio'
+# garbage collector thresholds, raise the first to collect less often
+# gc_threshold = (700, 10, 10)
+# asyncio debug mode, logs slow callbacks and unawaited coroutines but slows the bot down
+loop_debug = False
+
 dm_only = False  # bot responses always sent via direct message
 delete_commands = False  # user commands are deleted automatically
 
@@ -1,10 +1,15 @@
+import copy
+import cProfile
 import io
 import os
 import platform
+import pstats
 import textwrap
+import time
 import traceback
 import unicodedata
 from contextlib import redirect_stdout
+from pathlib import Path
 
 import discord
 from discord.ext import commands
@@ -12,6 +17,11 @@ from discord.ext import commands
 from firetail import utils
 from firetail.core import checks
 
+PROFILE_DIR = 'profiles'
+
+# builtins the event loop sits in while it waits for I/O
+IDLE_CALLS = ('select.', '_overlapped.')
+
 
 def cleanup_code(content):
     """Automatically removes code blocks from the code."""
@@ -39,6 +49,33 @@ def codeblock(contents, syntax="py"):
     return paginator.pages
 
 
+def function_name(key):
+    filename, line, name = key
+    if filename == '~':
+        return name
+    return f'{Path(filename).name}:{line}({name})'
+
+
+def profile_report(stats, sort, limit):
+    """Table of the top `limit` functions, sorted by ``cumulative`` or ``tottime``."""
+
+    column = 3 if sort == 'cumulative' else 2
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][column], reverse=True)
+    lines = [f"{'cumtime':>8} {'tottime':>8} {'calls':>7}  function"]
+    for key, (_, calls, tottime, cumtime, _) in rows[:limit]:
+        lines.append(f'{cumtime:8.3f} {tottime:8.3f} {calls:7}  {function_name(key)}')
+    return '\n'.join(lines)
+
+
+def idle_time(stats):
+    """Seconds the event loop spent waiting for I/O in the selector."""
+
+    return sum(
+        tottime for (filename, _, name), (_, _, tottime, _, _) in stats.stats.items()
+        if filename == '~' and any(call in name for call in IDLE_CALLS)
+    )
+
+
 class Dev(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -145,6 +182,56 @@ class Dev(commands.Cog):
         ctx.message.author = member
         await ctx.bot.process_commands(ctx.message)
 
+    @commands.command()
+    @checks.is_owner()
+    async def profile(self, ctx, *, new_cmd):
+        """
+        Run a command under the profiler and show where the time went.
+
+        Everything else running on the event loop meanwhile is included
+        in the profile, and the profiler's own overhead inflates the
+        time spent running. The full profile is saved for pstats or
+        snakeviz, in the configured ``profile_dir`` or ``profiles`` in
+        the working directory.
+        """
+
+        message = copy.copy(ctx.message)
+        message.content = ctx.prefix + new_cmd
+        new_ctx = await ctx.bot.get_context(message)
+        if new_ctx.command is None:
+            embed = utils.make_embed(msg_type='error', title='No command found.')
+            return await ctx.send(embed=embed)
+
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            await ctx.bot.invoke(new_ctx)
+        finally:
+            profiler.disable()
+        wall = time.perf_counter() - start
+
+        try:
+            profile_dir = ctx.bot.config.profile_dir
+        except AttributeError:
+            profile_dir = PROFILE_DIR
+        os.makedirs(profile_dir, exist_ok=True)
+        name = new_ctx.command.qualified_name.replace(' ', '_')
+        path = os.path.join(profile_dir, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}.prof")
+        profiler.dump_stats(path)
+
+        stats = pstats.Stats(profiler)
+        idle = min(idle_time(stats), wall)
+        report = '\n\n'.join((
+            f'{new_cmd}\n'
+            f'wall {wall:.3f}s: {wall - idle:.3f}s running on the loop, {idle:.3f}s waiting for I/O\n'
+            f'saved to {path}',
+            'Top by cumulative time\n' + profile_report(stats, 'cumulative', 15),
+            'Top by own time\n' + profile_report(stats, 'tottime', 15),
+        ))
+        for page in codeblock(report, syntax=''):
+            await ctx.send(page)
+
     @commands.command(aliases=['cls'])
     async def clear_console(self, ctx):
         """Clear the console"""
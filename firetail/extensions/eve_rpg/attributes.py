@@ -0,0 +1,109 @@
+from functools import lru_cache
+
+# attack, defense, maneuverability, tracking
+SHIPS = {
+    'Ibis': (0, 0, 1, 1),
+    'Rifter': (2, 1, 4, 3),
+    'Slicer': (2, 1, 4, 3),
+    'Dramiel': (3, 1, 5, 3),
+    'Firetail': (3, 1, 5, 3),
+    'Claw': (2, 1, 7, 4),
+    'Raptor': (2, 1, 7, 4),
+    'Crusader': (2, 1, 7, 4),
+    'Taranis': (2, 1, 7, 4),
+    'Catalyst': (6, 2, 3, 4),
+    'Thrasher': (6, 2, 3, 4),
+    'Coercer': (6, 2, 3, 4),
+    'Svipul': (5, 3, 3, 4),
+    'Jackdaw': (5, 3, 3, 4),
+    'Caracal': (6, 3, 3, 8),
+    'Rupture': (9, 5, 2, 2),
+    'Moa': (9, 5, 2, 2),
+    'Vexor': (8, 5, 2, 6),
+    'Vexor Navy Issue': (12, 6, 2, 6),
+    'Hurricane': (12, 6, 2, 3),
+    'Ferox': (12, 6, 2, 3),
+    'Harbinger': (12, 6, 2, 3),
+    'Vagabond': (10, 5, 4, 4),
+    'Muninn': (11, 5, 3, 5),
+    'Eagle': (11, 5, 3, 5),
+    'Cerberus': (10, 4, 4, 8),
+    'Drake': (10, 8, 2, 8),
+    'Tempest': (18, 10, 1, 3),
+    'Megathron': (18, 10, 1, 3),
+    'Abaddon': (18, 10, 1, 3),
+    'Raven': (16, 10, 1, 6),
+    'Dominix': (14, 10, 1, 6),
+    'Vargur': (18, 20, 1, 3),
+    'Paladin': (18, 20, 1, 3),
+    'Panther': (16, 10, 6, 3),
+    'Machariel': (20, 15, 2, 3),
+    'Nightmare': (20, 15, 2, 3),
+    'Vindicator': (20, 15, 2, 3),
+    'Barghest': (20, 13, 3, 5),
+    'Rattlesnake': (20, 13, 3, 5),
+    'Thanatos': (30, 45, 2, 3),
+    'Archon': (30, 45, 2, 3),
+    'Nidhoggur': (30, 45, 2, 3),
+    'Chimera': (30, 45, 2, 3),
+    'Naglfar': (45, 40, 2, 2),
+    'Phoenix': (45, 40, 2, 2),
+    'Nyx': (60, 65, 2, 3),
+    'Hel': (60, 65, 2, 3),
+    'Aeon': (60, 65, 2, 3),
+    'Wyvern': (60, 65, 2, 3),
+    'Ragnarok': (80, 75, 1, 1),
+    'Avatar': (80, 75, 1, 1),
+    'Erebus': (80, 75, 1, 1),
+    'Leviathan': (80, 75, 1, 1),
+    'Revenant': (65, 70, 2, 3),
+}
+NO_STATS = (0, 0, 0, 0)
+
+# Items are stored per player as a bitmask using their position here,
+# so new items must only ever be appended.
+ITEMS = (
+    ('Armor Plate', (0, 1, -1, 0)),
+    ('Shield Extender', (0, 1, 0, 0)),
+    ('Gyrostabilizer', (1, 0, 0, 1)),
+    ('MWD', (0, 0, 2, -1)),
+    ('AB', (0, 0, 1, 0)),
+    ('Officer-Shield Mod', (0, 4, 0, 0)),
+    ('Faction-Shield Extender', (0, 3, 0, 0)),
+    ('Faction-Gyrostabilizer', (2, 0, 0, 2)),
+    ('Deadspace-MWD', (0, 0, 3, -1)),
+    ('Deadspace-AB', (0, 0, 2, 0)),
+)
+ITEM_BITS = {name: 1 << bit for bit, (name, _) in enumerate(ITEMS)}
+
+
+def items_to_mask(items):
+    """Convert the legacy comma-joined item text into a bitmask."""
+    if not items:
+        return 0
+    mask = 0
+    for name in items.split(', '):
+        mask |= ITEM_BITS.get(name.strip(), 0)
+    return mask
+
+
+def item_names(mask):
+    return [name for bit, (name, _) in enumerate(ITEMS) if mask >> bit & 1]
+
+
+@lru_cache(maxsize=None)
+def item_attributes(mask):
+    attack, defense, maneuverability, tracking = NO_STATS
+    for bit, (_, bonus) in enumerate(ITEMS):
+        if mask >> bit & 1:
+            attack += bonus[0]
+            defense += bonus[1]
+            maneuverability += bonus[2]
+            tracking += bonus[3]
+    return attack, defense, maneuverability, tracking
+
+
+def ship_attributes(ship, mask=0):
+    base = SHIPS.get(ship, NO_STATS)
+    bonus = item_attributes(mask)
+    return base[0] + bonus[0], base[1] + bonus[1], base[2] + bonus[2], base[3] + bonus[3]
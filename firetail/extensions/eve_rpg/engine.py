@@ -0,0 +1,387 @@
+"""Encounter resolution for the EVE RPG.
+
+Each tick samples a batch of players, pairs up the ones looking for PVP
+within the same level band and sends the rest ratting. All outcome
+tables have their cumulative weights precomputed, so rolls are a single
+bisect and batch draws are one ``random.choices`` call.
+
+Run headless to benchmark encounter throughput::
+
+    python -m firetail.extensions.eve_rpg.engine --simulate 100000
+"""
+
+import argparse
+import random
+import time
+from collections import defaultdict
+from itertools import accumulate
+
+from .attributes import ITEM_BITS, ship_attributes
+from .state import GameState, Player
+
+ENCOUNTERS_PER_TICK = 50
+LEVEL_BAND = 5
+
+
+class Table:
+    """Weighted outcome table with precomputed cumulative weights."""
+
+    __slots__ = ('values', 'cum_weights')
+
+    def __init__(self, entries):
+        self.values = [value for value, _ in entries]
+        self.cum_weights = list(accumulate(max(weight, 0) for _, weight in entries))
+
+    def roll(self, rng):
+        return rng.choices(self.values, cum_weights=self.cum_weights)[0]
+
+    def roll_many(self, rng, k):
+        return rng.choices(self.values, cum_weights=self.cum_weights, k=k)
+
+
+def chance(rng, yes, no):
+    """Roll a weighted yes/no outcome."""
+    return rng.random() * (yes + no) < yes
+
+
+PVP = Table([(True, 13), (False, 45)])
+
+PVE_DEATH = Table([
+    ('**{name}** flying in a {ship} died to gate guns.', 10),
+    ('**{name}** flying in a {ship} forgot to turn on their reps and died to rats.', 45),
+    ('**{name}** flying in a {ship} went afk in an anomaly and died.', 45),
+])
+PVE_FLEE = Table([
+    ('**{name}** flying in a {ship} had to take a bio break mid anomaly and docked up.', 10),
+    ('**{name}** flying in a {ship} overestimated their tank and fled the anomaly.', 45),
+    ('**{name}** flying in a {ship} almost died to gankers but was aligned and got away.', 45),
+])
+PVE_ESCALATION = Table([
+    ('**{name}** flying in a {ship} had their anomaly escalate and is enroute to the next system.', 50),
+    ('**{name}** flying in a {ship} got an escalation.', 50),
+])
+ESCALATION_DEATH = Table([
+    ('**{name}** flying in a {ship} died on their way to the escalation.', 10),
+    ('**{name}** flying in a {ship} forgot to turn on their reps and died to escalation rats.', 45),
+    ('**{name}** flying in a {ship} ran into incursion rats on a gate and died.', 45),
+    ('**{name}** flying in a {ship} shot a drifer, RIP.', 45),
+    ('**{name}** flying in a {ship} went afk in the escalation and died.', 45),
+])
+ESCALATION_FLEE = Table([
+    ('**{name}** flying in a {ship} ran into a camp on the way and ran away.', 10),
+    ('**{name}** flying in a {ship} overestimated their tank and fled the escalation.', 45),
+    ('**{name}** flying in a {ship} could not tank the escalation rats and had to flee.', 45),
+    ('**{name}** flying in a {ship} got camped into their home system and the escalation expired.', 45),
+    ('**{name}** flying in a {ship} almost died to gankers but was aligned and got away.', 45),
+])
+PVE_SUCCESS = Table([
+    ('**{name}** flying in a {ship} completed an anomaly in PL staging.', 10),
+    ('**{name}** flying in a {ship} successfully completed an anomaly.', 45),
+    ('**{name}** flying in a {ship} ran a faction warfare node.', 45),
+    ('**{name}** flying in a {ship} killed some belt rats.', 45),
+    ('**{name}** flying in a {ship} killed some rats on a gate during a PVP op #iskPositive.', 45),
+    ('**{name}** flying in a {ship} AFK ratted their way thru an anomaly.', 45),
+])
+PVE_NEW_SHIP = Table([
+    ('**{name}** swapped their {ship} for a **{new_ship}** that they found abandoned next to an old POS.', 10),
+    ('**{name}** wanted to fly something new so they traded in their {ship} for a **{new_ship}**.', 45),
+    ('**{name}** sold some salvage and swapped their {ship} for a **{new_ship}**.', 45),
+])
+PVE_NEW_ITEM = Table([
+    ('**{name}** salvaged a **{item}**.', 45),
+    ('**{name}** sold the loot from their last fight and decided to buy a **{item}**.', 45),
+])
+PVE_XP = Table([(3, 45), (5, 15), (7, 5)])
+
+PVP_KILL = Table([
+    ('**PVP** - **{winner}** flying in a {winner_ship} got a dank tick when **{loser}** flying in a {loser_ship} '
+     'tried to gank him and failed.', 10),
+    ('**PVP** - **{loser}** flying in a {loser_ship} went AFK and got killed by **{winner}** in a {winner_ship}.', 45),
+    ('**PVP** - **{loser}** flying in a {loser_ship} was trying to Krab but **{winner}** in a {winner_ship} had '
+     'other ideas and killed him.', 45),
+    ('**PVP** - **{loser}** flying in a {loser_ship} ran into a {winner_ship} while roaming for content. '
+     'Honorable PVP occurred and **{winner}** was victorious.', 10),
+    ('**PVP** - **{loser}** flying in a {loser_ship} encountered **{winner}** on a gate and was defeated by their '
+     'superior {winner_ship}.', 45),
+    ('**PVP** - **{loser}** flying in a {loser_ship} tried desperately to defeat **{winner}** but was unable to '
+     'escape the scram of the enemies {winner_ship}.', 45),
+    ('**PVP** - **{loser}** flying in a {loser_ship} ran into **{winner}** in a {winner_ship} on a gate and was '
+     'killed as soon as he de-cloaked.', 10),
+    ('**PVP** - **{loser}** flying in a {loser_ship} had their auto-pilot turned on and was killed by **{winner}** '
+     'in a {winner_ship} at a gate.', 45),
+    ('**PVP** - **{loser}** flying in a {loser_ship} tried to warp away from a gate but **{winner}** in a '
+     '{winner_ship} was able to get point and kill them.', 45),
+])
+PVP_ESCAPE = Table([
+    ('**PVP** - **{winner}** flying in a {winner_ship} got a dank tick when **{loser}** flying in a {loser_ship} '
+     'tried to gank him and but was unable to catch him before he escaped.', 45),
+    ('**PVP** - **{loser}** flying in a {loser_ship} encountered **{winner}** on a gate in a {winner_ship}. '
+     'He was able to spam jump and escape', 45),
+    ('**PVP** - **{loser}** flying in a {loser_ship} ran into **{winner}** in a {winner_ship} on a gate but was '
+     'able to burn back when he de-cloaked.', 45),
+])
+PVP_NEW_SHIP = Table([
+    ('**{name}** swapped their {ship} for a **{new_ship}** that they found abandoned next to an old POS.', 10),
+    ('**{name}** wanted to fly something new so they traded in their {ship} for a **{new_ship}**.', 45),
+    ('**{name}** sold the loot from their last fight and decided to swap their {ship} for a **{new_ship}**.', 45),
+])
+PVP_NEW_ITEM = Table([
+    ('**{name}** salvaged a **{item}**.', 45),
+    ('**{name}** sold the loot from their last fight and decided to buy a **{item}**.', 45),
+    ('**{name}** found a **{item}** in a wreck.', 45),
+])
+PVP_XP = Table([(5, 45), (7, 15), (10, 5)])
+
+ITEM_DROPS = Table([
+    ('Armor Plate', 10), ('Shield Extender', 5), ('Gyrostabilizer', 8), ('MWD', 8), ('AB', 10), (None, 35)
+])
+ESCALATION_ITEM_DROPS = Table([
+    ('Faction-Gyrostabilizer', 10), ('Faction-Shield Extender', 5), ('Deadspace-MWD', 8), ('Deadspace-AB', 8),
+    ('Officer-Shield Mod', 2), (None, 35)
+])
+
+SHIP_DROPS = {
+    1: Table([('Rifter', 25), ('Slicer', 25), ('Firetail', 5), ('Dramiel', 5)]),
+    2: Table([('Firetail', 15), ('Dramiel', 15), ('Thrasher', 15), ('Catalyst', 15), ('Claw', 10), ('Crusader', 10),
+              ('Raptor', 10), ('Taranis', 10)]),
+    3: Table([('Thrasher', 15), ('Svipul', 15), ('Jackdaw', 15), ('Coercer', 5)]),
+    4: Table([('Caracal', 15), ('Vexor', 15), ('Moa', 15), ('Rupture', 15), ('Vexor Navy Issue', 5)]),
+    5: Table([('Hurricane', 15), ('Ferox', 15), ('Drake', 15), ('Harbinger', 5), ('Vagabond', 5), ('Muninn', 5),
+              ('Cerberus', 5), ('Eagle', 5)]),
+    6: Table([('Tempest', 15), ('Raven', 15), ('Megathron', 15), ('Dominix', 15), ('Abaddon', 15), ('Vargur', 5),
+              ('Paladin', 5), ('Panther', 5)]),
+    7: Table([('Machariel', 15), ('Nightmare', 15), ('Rattlesnake', 15), ('Vindicator', 15), ('Barghest', 15),
+              ('Thanatos', 3), ('Archon', 3), ('Nidhoggur', 3), ('Chimera', 3)]),
+    8: Table([('Thanatos', 15), ('Archon', 15), ('Nidhoggur', 15), ('Naglfar', 15), ('Phoenix', 15), ('Nyx', 3),
+              ('Hel', 3), ('Revenant', 1)]),
+    9: Table([('Nyx', 15), ('Hel', 15), ('Wyvern', 15), ('Aeon', 15), ('Avatar', 3), ('Ragnarok', 3),
+              ('Revenant', 1)]),
+    10: Table([('Avatar', 15), ('Ragnarok', 15), ('Erebus', 15), ('Leviathan', 15), ('Revenant', 1)]),
+}
+
+
+def ship_tiers(level):
+    """Ship tier drop table, with higher tiers opening up as players level."""
+    return Table([(1, 75), (2, 70), (3, 65), (4, 50 + level), (5, 40 + level), (6, 20 + level), (7, level),
+                  (8, -10 + level), (9, -25 + level), (10, -50 + level)])
+
+
+class Engine:
+    """Resolves batches of RPG encounters against a `GameState`.
+
+    Players are mutated in place and marked dirty on the state, so the
+    whole tick is persisted by the following `GameState.checkpoint`.
+    """
+
+    def __init__(self, state, rng=None):
+        self.state = state
+        self.rng = rng or random.Random()
+        self.encounters = 0
+
+    def tick(self, count, name_of):
+        """Resolve up to `count` encounters.
+
+        Parameters
+        ----------
+        count: `int`
+            Maximum number of players to take part in this tick.
+        name_of: Callable[[int], Optional[str]]
+            Returns the display name for a player ID, or `None` if the
+            player can no longer be found.
+
+        Returns
+        -------
+        Tuple[List[str], List[int]]
+            The turn messages, and the IDs of players with no name.
+        """
+        names = {}
+        missing = []
+        for player in self.state.sample(count, rng=self.rng):
+            name = name_of(player.id)
+            if name is None:
+                missing.append(player.id)
+            else:
+                names[player.id] = name
+
+        players = [self.state.get(player_id) for player_id in names]
+        pve = []
+        bands = defaultdict(list)
+        for player, pvp in zip(players, PVP.roll_many(self.rng, len(players))):
+            if player.ship is None:
+                player.ship = 'Ibis'
+                self.state.mark(player)
+            if pvp:
+                bands[player.level // LEVEL_BAND].append(player)
+            else:
+                pve.append(player)
+
+        messages = []
+        for band in bands.values():
+            for player, opponent in zip(band[::2], band[1::2]):
+                messages.extend(self.pvp(player, opponent, names))
+                self.encounters += 1
+            if len(band) % 2:
+                pve.append(band[-1])
+
+        for player in pve:
+            messages.extend(self.pve(player, names[player.id]))
+            self.encounters += 1
+
+        return messages, missing
+
+    def pve(self, player, name):
+        rng = self.rng
+        ship = player.ship
+        _, defense, maneuverability, _ = ship_attributes(ship, player.items)
+        death = chance(rng, 11, 75 + ((defense * 1.5) + (maneuverability * 1.2)))
+        flee = chance(rng, 13 + (defense + (maneuverability * 2)), 80 - (maneuverability * 2))
+        escalation = chance(rng, 4, 96)
+        if death and not flee:
+            self.lose_ship(player, keep_items=True)
+            return [PVE_DEATH.roll(rng).format(name=name, ship=ship)]
+        if flee:
+            return [PVE_FLEE.roll(rng).format(name=name, ship=ship)]
+
+        messages = []
+        if escalation:
+            messages.append(PVE_ESCALATION.roll(rng).format(name=name, ship=ship))
+            death = chance(rng, 11, 75 + ((defense * 1.5) + (maneuverability * 1.2)))
+            flee = chance(rng, 13 + (defense + (maneuverability * 2)), 87)
+            if death and not flee:
+                self.lose_ship(player)
+                messages.append(ESCALATION_DEATH.roll(rng).format(name=name, ship=ship))
+                return messages
+            if flee:
+                messages.append(ESCALATION_FLEE.roll(rng).format(name=name, ship=ship))
+                return messages
+
+        self.add_xp(player, PVE_XP.roll(rng))
+        messages.append(PVE_SUCCESS.roll(rng).format(name=name, ship=ship))
+        weight = 90 if ship == 'Ibis' else 14
+        if chance(rng, weight, 76):
+            new_ship = self.new_ship(player)
+            if new_ship is not None:
+                messages.append(PVE_NEW_SHIP.roll(rng).format(name=name, ship=ship, new_ship=new_ship))
+        new_item = self.new_item(player, escalation)
+        if new_item is not None:
+            messages.append(PVE_NEW_ITEM.roll(rng).format(name=name, item=new_item))
+        return messages
+
+    def pvp(self, player, opponent, names):
+        rng = self.rng
+        attack, defense, maneuverability, tracking = ship_attributes(player.ship, player.items)
+        attack_two, defense_two, maneuverability_two, tracking_two = ship_attributes(opponent.ship, opponent.items)
+        tracking_one = 0.975 if tracking < maneuverability_two else 1
+        tracking_two = 0.975 if tracking_two < maneuverability else 1
+        player_weight = (((player.level + 1) * 0.5) + (attack - (defense_two / 2))) * tracking_one
+        opponent_weight = (((opponent.level + 1) * 0.5) + (attack_two - (defense / 2))) * tracking_two
+        if player_weight > opponent_weight:
+            winner, loser = player, opponent
+            winner_man, loser_man = maneuverability, maneuverability_two
+        else:
+            winner, loser = opponent, player
+            winner_man, loser_man = maneuverability_two, maneuverability
+        escape = loser_man > winner_man and rng.randint(0, 5) > 3 and rng.randint(0, 12) < loser_man
+
+        winner_name = names[winner.id]
+        winner_ship = winner.ship
+        fields = dict(winner=winner_name, winner_ship=winner_ship, loser=names[loser.id], loser_ship=loser.ship)
+        if escape:
+            messages = [PVP_ESCAPE.roll(rng).format(**fields)]
+        else:
+            messages = [PVP_KILL.roll(rng).format(**fields)]
+            self.lose_ship(loser)
+            winner.kills += 1
+        self.add_xp(winner, PVP_XP.roll(rng))
+
+        weight = 90 if winner_ship == 'Ibis' else 7
+        if chance(rng, weight, 76):
+            new_ship = self.new_ship(winner)
+            if new_ship is not None:
+                messages.append(PVP_NEW_SHIP.roll(rng).format(name=winner_name, ship=winner_ship, new_ship=new_ship))
+        new_item = self.new_item(winner)
+        if new_item is not None:
+            messages.append(PVP_NEW_ITEM.roll(rng).format(name=winner_name, item=new_item))
+        return messages
+
+    def lose_ship(self, player, keep_items=False):
+        player.ship = 'Ibis'
+        if not keep_items:
+            player.items = 0
+        player.losses += 1
+        self.state.mark(player)
+
+    def add_xp(self, player, xp_gained):
+        if player.xp + xp_gained < 100 * player.level:
+            player.xp += xp_gained
+        else:
+            player.level += 1
+            player.xp = 0
+        self.state.mark(player)
+
+    def new_item(self, player, escalation=False):
+        table = ESCALATION_ITEM_DROPS if escalation else ITEM_DROPS
+        item = table.roll(self.rng)
+        if item is None:
+            return None
+        bit = ITEM_BITS[item]
+        if player.items & bit:
+            return None
+        player.items |= bit
+        self.state.mark(player)
+        return item
+
+    def new_ship(self, player):
+        tier = ship_tiers(player.level).roll(self.rng)
+        ship = SHIP_DROPS[tier].roll(self.rng)
+        current_sum = sum(ship_attributes(player.ship, player.items))
+        new_sum = sum(ship_attributes(ship, player.items))
+        if ship != player.ship and new_sum > current_sum:
+            player.ship = ship
+            self.state.mark(player)
+            return ship
+        return None
+
+
+def simulate(encounters, players, per_tick, seed=None):
+    """Run the engine against synthetic players without the bot or db."""
+    rng = random.Random(seed)
+    state = GameState()
+    for player_id in range(players):
+        state.add(Player(player_id, 0))
+    engine = Engine(state, rng)
+    ticks = 0
+    messages = 0
+    start = time.perf_counter()
+    while engine.encounters < encounters:
+        resolved = engine.encounters
+        turn, _ = engine.tick(per_tick, str)
+        if engine.encounters == resolved:
+            raise ValueError(f"Tick {ticks + 1} resolved no encounters, the simulation can't progress.")
+        messages += len(turn)
+        ticks += 1
+    elapsed = time.perf_counter() - start
+    return engine.encounters, ticks, messages, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the EVE RPG encounter engine.")
+    parser.add_argument("--simulate", type=int, metavar="N", required=True, help="Encounters to resolve.")
+    parser.add_argument("--players", type=int, default=10000, help="Synthetic players to sign up.")
+    parser.add_argument("--per-tick", type=int, default=ENCOUNTERS_PER_TICK, help="Players sampled per tick.")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    if args.players < 2:
+        parser.error("--players must be at least 2")
+    if args.per_tick < 1:
+        parser.error("--per-tick must be at least 1")
+    try:
+        encounters, ticks, messages, elapsed = simulate(args.simulate, args.players, args.per_tick, args.seed)
+    except ValueError as e:
+        parser.exit(1, f"error: {e}\n")
+    print(f"{encounters:,} encounters in {ticks:,} ticks ({messages:,} messages) in {elapsed:.3f}s")
+    print(f"{encounters / elapsed:,.0f} encounters/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+from bisect import bisect_left, insort
+
+METRICS = ('level', 'kills')
+
+
+class Leaderboard:
+    """Players ranked by a single metric.
+
+    Entries are kept sorted as ``(-score, player_id)`` keys, so score
+    changes are a bisect and the top K is a slice.
+    """
+
+    __slots__ = ('_keys', '_scores')
+
+    def __init__(self):
+        self._keys = []
+        self._scores = {}
+
+    def __len__(self):
+        return len(self._keys)
+
+    def update(self, player_id, score):
+        old = self._scores.get(player_id)
+        if old == score:
+            return
+        if old is not None:
+            self._discard(player_id, old)
+        insort(self._keys, (-score, player_id))
+        self._scores[player_id] = score
+
+    def remove(self, player_id):
+        old = self._scores.pop(player_id, None)
+        if old is not None:
+            self._discard(player_id, old)
+
+    def _discard(self, player_id, score):
+        index = bisect_left(self._keys, (-score, player_id))
+        del self._keys[index]
+
+    def top(self, k):
+        """Return up to `k` ``(player_id, score)`` pairs, best first."""
+        return [(player_id, -score) for score, player_id in self._keys[:k]]
+
+    def rank(self, player_id):
+        score = self._scores.get(player_id)
+        if score is None:
+            return None
+        return bisect_left(self._keys, (-score, player_id)) + 1
+
+
+class Leaderboards:
+    """Global and per server leaderboards for each metric in `METRICS`."""
+
+    def __init__(self):
+        self.global_boards = {metric: Leaderboard() for metric in METRICS}
+        self.server_boards = {}
+
+    def _boards(self, player):
+        yield from self.global_boards.items()
+        server = self.server_boards.get(player.server_id)
+        if server is None:
+            server = self.server_boards[player.server_id] = {metric: Leaderboard() for metric in METRICS}
+        yield from server.items()
+
+    def update(self, player):
+        for metric, board in self._boards(player):
+            board.update(player.id, getattr(player, metric))
+
+    def remove(self, player):
+        for _, board in self._boards(player):
+            board.remove(player.id)
+
+    def top(self, metric, k=10, server_id=None):
+        if server_id is None:
+            return self.global_boards[metric].top(k)
+        server = self.server_boards.get(server_id)
+        if server is None:
+            return []
+        return server[metric].top(k)
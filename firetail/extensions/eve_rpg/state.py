@@ -0,0 +1,164 @@
+import asyncio
+import logging
+import random
+import sqlite3
+
+from firetail.lib import db
+from .attributes import items_to_mask
+from .leaderboard import Leaderboards
+
+log = logging.getLogger(__name__)
+
+UPDATE_PLAYERS = ''' UPDATE eve_rpg_players
+        SET kills = (?),
+            losses = (?),
+            level = (?),
+            xp = (?),
+            ship = (?),
+            items = (?)
+        WHERE
+            player_id = (?); '''
+
+
+class Player:
+    __slots__ = ('id', 'server_id', 'kills', 'losses', 'level', 'xp', 'ship', 'items')
+
+    def __init__(self, player_id, server_id, kills=0, losses=0, level=0, xp=0, ship=None, items=0):
+        self.id = player_id
+        self.server_id = server_id
+        self.kills = kills
+        self.losses = losses
+        self.level = level
+        self.xp = xp
+        self.ship = ship
+        self.items = items
+
+    def __repr__(self):
+        return f"<Player {self.id} level={self.level} ship={self.ship} kills={self.kills} losses={self.losses}>"
+
+    def as_row(self):
+        return self.kills, self.losses, self.level, self.xp, self.ship, self.items, self.id
+
+
+class GameState:
+    """In-memory store of RPG players.
+
+    Players are kept in a dict for lookups and a flat list for O(1)
+    random selection. Modified players are tracked and written back to
+    the database in one batch by `checkpoint`, so the cost of a turn
+    doesn't depend on the number of signed up players. Leaderboards are
+    kept up to date as players are added and marked.
+    """
+
+    def __init__(self):
+        self.players = {}
+        self.leaderboards = Leaderboards()
+        self.loaded = False
+        self._order = []
+        self._index = {}
+        self._dirty = set()
+
+    def __len__(self):
+        return len(self._order)
+
+    def __contains__(self, player_id):
+        return player_id in self.players
+
+    async def load(self):
+        await db.add_column('eve_rpg_players', 'items', 'INTEGER DEFAULT 0')
+        await self.migrate_items()
+        sql = "SELECT player_id, server_id, kills, losses, level, xp, ship, items FROM eve_rpg_players"
+        rows = await db.select(sql) or []
+        for row in rows:
+            self.add(Player(*row))
+        self._dirty.clear()
+        self.loaded = True
+        log.debug(f"Loaded {len(self)} RPG players.")
+
+    @staticmethod
+    async def migrate_items():
+        """Convert the legacy text item lists into item bitmasks."""
+        sql = "SELECT player_id, item FROM eve_rpg_players WHERE item IS NOT NULL"
+        rows = await db.select(sql)
+        if not rows:
+            return
+        values = [(items_to_mask(item), player_id) for player_id, item in rows]
+        sql = "UPDATE eve_rpg_players SET items = (?), item = NULL WHERE player_id = (?)"
+        await db.execute_many(sql, values)
+        log.info(f"Migrated items for {len(values)} RPG players.")
+
+    def get(self, player_id):
+        return self.players.get(player_id)
+
+    def add(self, player):
+        if player.id in self._index:
+            self.leaderboards.remove(self.players[player.id])
+        else:
+            self._index[player.id] = len(self._order)
+            self._order.append(player.id)
+        self.players[player.id] = player
+        self.leaderboards.update(player)
+
+    def remove(self, player_id):
+        """Drop a player, swapping the last entry into its slot."""
+        index = self._index.pop(player_id, None)
+        if index is None:
+            return
+        last = self._order.pop()
+        if last != player_id:
+            self._order[index] = last
+            self._index[last] = index
+        self.leaderboards.remove(self.players.pop(player_id))
+        self._dirty.discard(player_id)
+
+    def sample(self, k, rng=random):
+        """Pick up to `k` distinct players at random."""
+        player_ids = rng.sample(self._order, min(k, len(self._order)))
+        return [self.players[player_id] for player_id in player_ids]
+
+    def mark(self, player):
+        self._dirty.add(player.id)
+        self.leaderboards.update(player)
+
+    def _take_dirty(self):
+        dirty, self._dirty = self._dirty, set()
+        return dirty, [self.players[player_id].as_row() for player_id in dirty]
+
+    def _restore_dirty(self, dirty):
+        # keep the changes around for the next attempt
+        self._dirty.update(p for p in dirty if p in self.players)
+
+    async def checkpoint(self):
+        """Write all modified players to the database in one transaction."""
+        if not self._dirty:
+            return 0
+        dirty, rows = self._take_dirty()
+        try:
+            await db.execute_many(UPDATE_PLAYERS, rows)
+        except (Exception, asyncio.CancelledError):
+            self._restore_dirty(dirty)
+            raise
+        log.debug(f"Checkpointed {len(rows)} RPG players.")
+        return len(rows)
+
+    def flush(self):
+        """Write all modified players now, blocking until they're written.
+
+        For when the loop might not run again, such as on unload or
+        shutdown. Skips the `db` lock, sqlite waits for any other write.
+        """
+        if not self._dirty:
+            return 0
+        dirty, rows = self._take_dirty()
+        conn = sqlite3.connect(db.DATABASE)
+        try:
+            with conn:
+                conn.executemany(UPDATE_PLAYERS, rows)
+        except sqlite3.Error:
+            self._restore_dirty(dirty)
+            log.exception(f"Unable to save {len(rows)} RPG players.")
+            return 0
+        finally:
+            conn.close()
+        log.debug(f"Flushed {len(rows)} RPG players.")
+        return len(rows)
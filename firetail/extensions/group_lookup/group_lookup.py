@@ -1,9 +1,8 @@
-import json
+import asyncio
 import logging
 import re
 from urllib import parse
 
-import aiohttp
 from discord.ext import commands
 
 from firetail.core import checks
@@ -21,36 +20,13 @@ class GroupLookup(commands.Cog):
         """Shows corp and alliance information."""
 
         log.info(f'GroupLookup - {ctx.author} requested group info for the group {name}')
-        corp_data = None
-        alliance_data = None
-        corp_id = None
-        alliance_id = None
-        corp = 'corporation'
-        corp_ids = await ctx.bot.esi_data.esi_search(name, corp)
-        if corp_ids is not None and 'corporation' in corp_ids:
-            if len(corp_ids['corporation']) > 1:
-                for corporation_id in corp_ids['corporation']:
-                    group_data = await ctx.bot.esi_data.corporation_info(corporation_id)
-                    if group_data['name'].lower().strip() == name.lower().strip():
-                        corp_id = corporation_id
-                        corp_data = await ctx.bot.esi_data.corporation_info(corp_id)
-                        break
-            elif len(corp_ids['corporation']) == 1:
-                corp_id = corp_ids['corporation'][0]
-                corp_data = await ctx.bot.esi_data.corporation_info(corp_id)
-        alliance = 'alliance'
-        alliance_ids = await ctx.bot.esi_data.esi_search(name, alliance)
-        if alliance_ids is not None and 'alliance' in alliance_ids:
-            if len(alliance_ids['alliance']) > 1:
-                for ally_id in alliance_ids['alliance']:
-                    group_data = await ctx.bot.esi_data.alliance_info(ally_id)
-                    if group_data['name'].lower().strip() == name.lower().strip():
-                        alliance_id = ally_id
-                        alliance_data = await ctx.bot.esi_data.alliance_info(alliance_id)
-                        break
-            elif len(alliance_ids['alliance']) == 1:
-                alliance_id = alliance_ids['alliance'][0]
-                alliance_data = await ctx.bot.esi_data.alliance_info(alliance_id)
+        ids = await ctx.bot.resolver.resolve(name, 'corporation', 'alliance')
+        corp_id = ids['corporation']
+        alliance_id = ids['alliance']
+        corp_data, alliance_data = await asyncio.gather(
+            ctx.bot.esi_data.corporation_info(corp_id) if corp_id else asyncio.sleep(0),
+            ctx.bot.esi_data.alliance_info(alliance_id) if alliance_id else asyncio.sleep(0),
+        )
 
         # Check if a corp and alliance were both found
         if corp_data is not None and alliance_data is not None:
@@ -210,11 +186,4 @@ class GroupLookup(commands.Cog):
             await ctx.message.delete()
 
     async def zkill_stats(self, group_id, group_type):
-        async with aiohttp.ClientSession() as session:
-            url = f'https://zkillboard.com/api/stats/{group_type}/{group_id}/'
-            async with session.get(url) as resp:
-                data = await resp.text()
-                data = json.loads(data)
-                if 'allTimeSum' in data:
-                    return data
-                return None
+        return await self.bot.zkill.stats(group_type, group_id)
@@ -3,6 +3,9 @@ import logging
 from discord.ext import commands
 
 from firetail.core import checks
+from firetail.lib.jumps import jump_range
+from firetail.lib.resolver import normalize
+from firetail.lib.sde import is_system, rounded_security
 
 log = logging.getLogger(__name__)
 
@@ -33,19 +36,28 @@ class JumpPlanner(commands.Cog):
         skills = f'{jdc_level}55'
         x = 0
         url_route = []
+        waypoints = []
+        locations = ctx.bot.locations
+        if locations is None:
+            resolved = await ctx.bot.resolver.resolve_many(systems, 'solar_system')
         for system in systems:
-            search = 'solar_system'
-            system_id = await ctx.bot.esi_data.esi_search(system, search)
-            if system_id is None:
-                log.info(f'JumpPlanner ERROR - {system} could not be found')
-                await ctx.dest.send(f'**ERROR:** No system found with the name {system}')
-                return
-            if system_id is False:
-                log.info(f'JumpPlanner ERROR - {system} could not be found')
-                await ctx.dest.send(f'**ERROR:** Multiple systems found matching {system}, please be more specific')
-                return
-            system_info = await ctx.bot.esi_data.system_info(system_id['solar_system'][0])
-            if system_info['security_status'] >= 0.5 and x != 0:
+            if locations is not None:
+                system_id = locations.match(system, where=is_system)
+                if system_id is None:
+                    log.info(f'JumpPlanner ERROR - {system} could not be found')
+                    suggestions = locations.suggest(system, where=is_system)
+                    hint = ' Did you mean: {}?'.format(', '.join(suggestions)) if suggestions else ''
+                    await ctx.dest.send(f'**ERROR:** No system found with the name {system}.{hint}')
+                    return
+                system_info = locations.data(system_id).system_info()
+            else:
+                system_id = resolved['solar_system'][normalize(system)]
+                if system_id is None:
+                    log.info(f'JumpPlanner ERROR - {system} could not be found')
+                    await ctx.dest.send(f'**ERROR:** No system found with the name {system}')
+                    return
+                system_info = await ctx.bot.esi_data.system_info(system_id)
+            if rounded_security(system_info['security_status']) >= 0.5 and x != 0:
                 log.info(f'JumpPlanner ERROR - {system} is a high security system')
                 await ctx.dest.send(
                     f'**ERROR:** {system} is a high security system, you can only jump out of high security systems.'
@@ -53,22 +65,40 @@ class JumpPlanner(commands.Cog):
                 return
             x = x + 1
             url_route.append(system_info['name'])
+            waypoints.append(system_info['system_id'])
 
-        item_id = await ctx.bot.esi_data.item_id(ship)
         accepted_ship_groups = [898, 659, 485, 547, 902, 30, 1538]
-        ship_info = await ctx.bot.esi_data.item_info(item_id)
-        ship_group_id = ship_info['group_id']
+        if ctx.bot.types is not None:
+            item_id = ctx.bot.types.match(ship)
+            ship_group_id = ctx.bot.types.data(item_id)
+            if item_id is not None:
+                ship = ctx.bot.types.name(item_id)
+        else:
+            item_id = await ctx.bot.esi_data.item_id(ship)
+            ship_info = await ctx.bot.esi_data.item_info(item_id)
+            ship_group_id = ship_info['group_id']
         if ship_group_id not in accepted_ship_groups:
             dest = ctx.author if ctx.bot.config.dm_only else ctx
             log.info(f'JumpPlanner ERROR - {ship} is not a Jump Capable Ship')
             await dest.send(f'**ERROR:** No Jump Capable Ship Found With The Name {ship}')
             return
 
+        description = None
+        if ctx.bot.jumps is not None and locations is not None:
+            max_range = jump_range(ship_group_id, jdc_level)
+            planned = ctx.bot.jumps.plan(waypoints, max_range)
+            if planned is None:
+                log.info(f'JumpPlanner ERROR - No route found for {route}')
+                await ctx.dest.send(f'**ERROR:** No jump route found with a {max_range} ly jump range.')
+                return
+            description = self.describe_route(locations, planned)
+
         url_route = ':'.join(url_route)
         url = f'http://evemaps.dotlan.net/jump/{ship},{skills}/{url_route}'
         clean_route = url_route.replace(':', ' to ')
         embed = await ctx.embed(
             f"{ship} jump route from {clean_route} with JDC {jdc_level}",
+            description,
             icon="https://pbs.twimg.com/profile_images/1145561069/dotlan-avatar_400x400.png",
             title_url=url,
             send=False
@@ -77,3 +107,13 @@ class JumpPlanner(commands.Cog):
         await ctx.dest.send(embed=embed)
         if ctx.bot.config.delete_commands:
             await ctx.message.delete()
+
+    @staticmethod
+    def describe_route(locations, route):
+        lines = [f'Start: {locations.name(route[0][0])}']
+        for jump, (system_id, distance) in enumerate(route[1:], 1):
+            location = locations.data(system_id)
+            lines.append(f'{jump}: {location.name} ({rounded_security(location.security):.1f}) - {distance:.2f} ly')
+        total = sum(distance for _, distance in route)
+        lines.append(f'**{len(route) - 1} jumps, {total:.2f} ly**')
+        return '\n'.join(lines)
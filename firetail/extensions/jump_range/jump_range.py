@@ -3,9 +3,18 @@ import logging
 from discord.ext import commands
 
 from firetail.core import checks
+from firetail.lib.jumps import jump_range
+from firetail.lib.sde import is_system
 
 log = logging.getLogger(__name__)
 
+SECURITY_FILTERS = {
+    'low': lambda security: security > 0.0,
+    'null': lambda security: security <= 0.0,
+}
+MAX_REGIONS = 10
+MAX_REGION_SYSTEMS = 10
+
 
 class JumpRange(commands.Cog):
     """This extension handles the time commands."""
@@ -13,8 +22,13 @@ class JumpRange(commands.Cog):
     @commands.command()
     @checks.spam_check()
     @checks.is_whitelist()
-    async def range(self, ctx, system, ship: str.title, jdc_level: int = 5):
-        """Provides Jump Range."""
+    async def range(self, ctx, system, ship: str.title, jdc_level: int = 5, security: str = None):
+        """Provides Jump Range.
+
+        '!range system SHIP' lists the systems in range with JDC 5, grouped by region.
+        '!range system SHIP 4' This is also possible to declare a JDC besides 5.
+        '!range system SHIP 5 null' only lists nullsec systems, 'low' only lists lowsec.
+        """
 
         async with ctx.typing():
             log.info(f'JumpRange - {ctx.message.author} requested a jump range map.')
@@ -27,46 +41,107 @@ class JumpRange(commands.Cog):
                 await ctx.dest.send('**ERROR:** Do !help range for more info')
                 return
 
-            system_id = await ctx.bot.esi_data.esi_search(system, 'solar_system')
+            if ctx.bot.locations is not None:
+                system_id = ctx.bot.locations.match(system, where=is_system)
+                if system_id is None:
+                    dest = ctx.author if ctx.bot.config.dm_only else ctx
+                    log.info(f'JumpRange ERROR - {system} could not be found')
+                    suggestions = ctx.bot.locations.suggest(system, where=is_system)
+                    hint = ' Did you mean: {}?'.format(', '.join(suggestions)) if suggestions else ''
+                    await dest.send(f'**ERROR:** No system found with the name {system}.{hint}')
+                    return
+                system = ctx.bot.locations.name(system_id)
+                if ctx.bot.jumps is not None and system_id not in ctx.bot.jumps.positions:
+                    await ctx.dest.send(f'**ERROR:** No jump range from wormhole space, {system} is not in known space')
+                    return
+            else:
+                system_id = await ctx.bot.esi_data.esi_search(system, 'solar_system')
 
-            if system_id is None:
-                dest = ctx.author if ctx.bot.config.dm_only else ctx
-                log.info(f'JumpPlanner ERROR - {system} could not be found')
-                await dest.send(f'**ERROR:** No system found with the name {system}')
-                return
+                if system_id is None:
+                    dest = ctx.author if ctx.bot.config.dm_only else ctx
+                    log.info(f'JumpPlanner ERROR - {system} could not be found')
+                    await dest.send(f'**ERROR:** No system found with the name {system}')
+                    return
 
-            if system_id is False:
-                log.info(f'JumpPlanner ERROR - {system} could not be found')
-                await ctx.dest.send(f'**ERROR:** Multiple systems found matching {system}, please be more specific')
-                return
+                if system_id is False:
+                    log.info(f'JumpPlanner ERROR - {system} could not be found')
+                    await ctx.dest.send(
+                        f'**ERROR:** Multiple systems found matching {system}, please be more specific'
+                    )
+                    return
 
-            system_info = await ctx.bot.esi_data.system_info(system_id['solar_system'][0])
-            system = system_info['name']
+                system_info = await ctx.bot.esi_data.system_info(system_id['solar_system'][0])
+                system = system_info['name']
 
             if jdc_level > 5:
                 await ctx.dest.send('**ERROR:** Improper JDC skill level')
                 return
 
-            item_id = await ctx.bot.esi_data.item_id(ship)
+            if security is not None and security.lower() not in SECURITY_FILTERS:
+                await ctx.dest.send('**ERROR:** Security must be either low or null')
+                return
+
+            if ctx.bot.types is not None:
+                item_id = ctx.bot.types.match(ship)
+            else:
+                item_id = await ctx.bot.esi_data.item_id(ship)
             if not item_id:
                 await ctx.dest.send("**ERROR:** Invalid ship provided.")
                 return
 
             accepted_ship_groups = [898, 659, 485, 547, 902, 30, 1538]
-            ship_info = await ctx.bot.esi_data.item_info(item_id)
-            ship_group_id = ship_info['group_id']
+            if ctx.bot.types is not None:
+                ship = ctx.bot.types.name(item_id)
+                ship_group_id = ctx.bot.types.data(item_id)
+            else:
+                ship_info = await ctx.bot.esi_data.item_info(item_id)
+                ship_group_id = ship_info['group_id']
             if ship_group_id not in accepted_ship_groups:
                 log.info(f'JumpRange ERROR - {ship} is not a Jump Capable Ship')
                 await ctx.dest.send(f'**ERROR:** No Jump Capable Ship Found With The Name {ship}')
                 return
 
+            description = None
+            fields = None
+            if ctx.bot.locations is not None and ctx.bot.jumps is not None:
+                max_range = jump_range(ship_group_id, jdc_level)
+                keep = SECURITY_FILTERS.get(security.lower()) if security else None
+                description, fields = self.describe_range(ctx.bot.locations, ctx.bot.jumps, system_id, max_range, keep)
+
             url = f'http://evemaps.dotlan.net/range/{ship},{jdc_level}/{system}'
             embed = await ctx.embed(
                 f"{ship} jump range from {system} with JDC {jdc_level}",
+                description,
                 icon="https://pbs.twimg.com/profile_images/1145561069/dotlan-avatar_400x400.png",
                 title_url=url,
+                fields=fields,
                 send=False
             )
             await ctx.dest.send(embed=embed)
             if ctx.bot.config.delete_commands:
                 await ctx.message.delete()
+
+    @staticmethod
+    def describe_range(locations, jumps, system_id, max_range, keep=None):
+        """Summary line and a field per region for the systems in range."""
+        regions = []
+        total = 0
+        for region_id, systems in jumps.reachable(system_id, max_range):
+            if keep is not None:
+                systems = [system for system in systems if keep(jumps.security[system[0]])]
+            if systems:
+                regions.append((region_id, systems))
+                total += len(systems)
+        fields = {}
+        for region_id, systems in regions[:MAX_REGIONS]:
+            lines = [
+                f'{locations.name(destination)} ({jumps.security[destination]:.1f}) - {distance:.2f} ly'
+                for destination, distance in systems[:MAX_REGION_SYSTEMS]
+            ]
+            if len(systems) > MAX_REGION_SYSTEMS:
+                lines.append(f'...and {len(systems) - MAX_REGION_SYSTEMS} more')
+            fields[f'{locations.name(region_id)} ({len(systems)})'] = '\n'.join(lines)
+        description = f'{total} systems in {len(regions)} regions within {max_range} ly'
+        if len(regions) > MAX_REGIONS:
+            description += f', showing the nearest {MAX_REGIONS} regions'
+        return description, fields
@@ -0,0 +1,166 @@
+"""Killmail decoding, parsing and subscription matching benchmark.
+
+Run ``python -m firetail.extensions.killmail.benchmark`` for synthetic
+mails, or pass ``--file`` with recorded RedisQ or ESI responses, one JSON
+document per line. Decoding is timed with each installed JSON backend.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import tracemalloc
+
+from firetail.lib import codec
+from .objects import Mail, Subscription
+
+
+def synthetic_package(rng, kill_id, attackers):
+    def pilot():
+        return {
+            'character_id': rng.randint(90000000, 98000000),
+            'corporation_id': rng.randint(98000000, 98000500),
+            'alliance_id': rng.choice((None, rng.randint(99000000, 99000100))),
+            'ship_type_id': rng.randint(580, 40000),
+        }
+
+    attacker_list = []
+    for i in range(attackers):
+        attacker = pilot()
+        attacker.update(damage_done=rng.randint(0, 5000), final_blow=i == 0, security_status=0.0,
+                        weapon_type_id=rng.randint(2000, 3000))
+        attacker_list.append(attacker)
+    victim = pilot()
+    victim.update(damage_taken=rng.randint(1000, 100000), position={'x': 0.0, 'y': 0.0, 'z': 0.0}, items=[
+        {'flag': 27, 'item_type_id': rng.randint(2000, 3000), 'quantity_destroyed': 1, 'singleton': 0}
+        for _ in range(rng.randint(5, 40))
+    ])
+    return {
+        'killID': kill_id,
+        'killmail': {
+            'killmail_id': kill_id,
+            'killmail_time': '2019-07-01T12:00:00Z',
+            'solar_system_id': rng.randint(30000001, 30005000),
+            'attackers': attacker_list,
+            'victim': victim,
+        },
+        'zkb': {
+            'locationID': 40000001,
+            'hash': 'x',
+            'fittedValue': 1e7,
+            'totalValue': rng.lognormvariate(17, 2),
+            'points': 1,
+            'npc': rng.random() < 0.2,
+            'solo': attackers == 1,
+            'awox': False,
+        },
+    }
+
+
+def load_payloads(path):
+    with open(path, 'rb') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def load_packages(payloads):
+    packages = []
+    for payload in payloads:
+        data = codec.loads(payload)
+        package = data.get('package', data) if isinstance(data, dict) else None
+        if package and 'zkb' in package:
+            packages.append(package)
+    return packages
+
+
+def measure_decode(payloads, decode, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for payload in payloads:
+            decode(payload)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+async def process(package, subs, min_threshold=0, eager=False):
+    """Parse a mail and match it against the subscriptions, returning the number of matches."""
+    zkb = package['zkb']
+    if zkb.get('npc') or (zkb.get('totalValue') or 0) < min_threshold:
+        return 0
+    package['killmail']['zkb'] = zkb
+    mail = Mail(package['killmail'], None)
+    mail.region_id = 10000002
+    if eager:
+        mail.attackers
+        mail.victim.items
+    matched = 0
+    for sub in subs:
+        if await sub.valid(mail):
+            matched += 1
+    return matched
+
+
+def run(packages, subs, eager=False):
+    loop = asyncio.get_event_loop()
+    min_threshold = min((sub.threshold or 0 for sub in subs), default=0)
+
+    async def process_all():
+        matched = 0
+        for package in packages:
+            matched += await process(package, subs, min_threshold, eager)
+        return matched
+
+    return loop.run_until_complete(process_all())
+
+
+def measure(packages, subs, eager):
+    start = time.perf_counter()
+    matched = run(packages, subs, eager)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    run(packages, subs, eager)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return matched, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark killmail parsing and matching.')
+    parser.add_argument('--file', help='recorded RedisQ or ESI responses, one JSON document per line')
+    parser.add_argument('--mails', type=int, default=2000, help='number of synthetic mails')
+    parser.add_argument('--attackers', type=int, default=50, help='attackers per synthetic mail')
+    parser.add_argument('--subs', type=int, default=200, help='number of subscriptions')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    if args.file:
+        payloads = load_payloads(args.file)
+    else:
+        payloads = [
+            json.dumps({'package': synthetic_package(rng, i, rng.randint(1, args.attackers * 2))}).encode()
+            for i in range(args.mails)
+        ]
+    packages = load_packages(payloads)
+    subs = [
+        Subscription(i, None, rng.choice((None, 10000000, 100000000)), True, rng.randint(98000000, 98000500))
+        for i in range(args.subs)
+    ]
+
+    size = sum(len(payload) for payload in payloads) / 1024 / 1024
+    print(f'{len(payloads)} documents, {size:,.1f} MiB, default decoder {codec.BACKEND}')
+    for name, (decode, _) in codec.BACKENDS.items():
+        elapsed = measure_decode(payloads, decode)
+        print(f'{name}: {len(payloads) / elapsed:,.0f} docs/s, {size / elapsed:,.1f} MiB/s')
+
+    if not packages:
+        return
+    print(f'{len(packages)} mails, {len(subs)} subscriptions')
+    for name, eager in (('lazy', False), ('eager', True)):
+        matched, elapsed, peak = measure(packages, subs, eager)
+        print(f'{name}: {len(packages) / elapsed:,.0f} mails/s, peak {peak / 1024:,.0f} KiB, {matched} matches')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,6 @@
 import asyncio
-import json
 import logging
+import re
 from typing import Optional
 
 import aiohttp
@@ -8,24 +8,30 @@ import discord
 from discord.ext import commands
 
 from firetail.core import checks
-from firetail.lib import db
+from firetail.lib import codec, db
 from firetail.utils.formatters import convert_to_bool
 from .objects import Mail, Subscription
 
 log = logging.getLogger(__name__)
 
+RADIUS_OPTION = re.compile(r'--radius[\s=]+(\d+)')
+MAX_RADIUS = 10
+
 
 class Killmail(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.subs = {}
+        self.min_threshold = 0
         self.ws_task = None
         self.km_counter = 0
         self.prepare = self.bot.loop.create_task(self.prepare_subs())
+        bot.metrics.gauge('firetail_killmail_subscriptions', lambda: len(self.subs))
+        bot.metrics.gauge('firetail_killmails_received', lambda: self.km_counter)
 
     @staticmethod
     async def get_subs(*, channel_id: int = None, sub_id: int = None):
-        sql = "SELECT id, channelid, serverid, losses, threshold, groupid FROM add_kills"
+        sql = "SELECT id, channelid, serverid, losses, threshold, groupid, radius FROM add_kills"
         if sub_id:
             sql += " WHERE id = (?)"
             result = await db.select_var(sql, (sub_id,))
@@ -41,37 +47,73 @@ class Killmail(commands.Cog):
 
     async def add_sub(
         self, channel_id: int, server_id: int, owner_id: int, group_id: int = 6, losses: str = 'true',
-        threshold: int = 1
+        threshold: int = 1, radius: int = 0
     ):
         sql = (
-            "INSERT INTO add_kills (channelid, serverid, groupid, ownerid, losses, threshold) "
-            "VALUES (?, ?, ?, ?, ?, ?)"
+            "INSERT INTO add_kills (channelid, serverid, groupid, ownerid, losses, threshold, radius) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)"
         )
-        id_ = await db.execute_sql(sql, (channel_id, server_id, group_id, owner_id, losses, threshold or 1))
-        sub = Subscription(id_, self.bot.get_channel(channel_id), threshold, convert_to_bool(losses), group_id)
+        values = (channel_id, server_id, group_id, owner_id, losses, threshold or 1, radius)
+        id_ = await db.execute_sql(sql, values)
+        sub = Subscription(id_, self.bot.get_channel(channel_id), threshold, convert_to_bool(losses), group_id, radius)
+        if radius and self.bot.gates is not None:
+            self.set_radius_systems(sub)
         self.subs[sub.id] = sub
+        self.update_min_threshold()
+
+    def set_radius_systems(self, sub):
+        """Precompute the systems a radius subscription matches."""
+        sub.systems = frozenset(self.bot.gates.within(sub.group_id, sub.radius))
+        if not sub.systems:
+            log.warning(f'Killmail sub {sub.id} has a radius around {sub.group_id}, '
+                        f'which is not a system with stargates, so it will match nothing.')
+
+    async def prepare_radius_subs(self):
+        await self.bot.sde_ready.wait()
+        radius_subs = [sub for sub in self.subs.values() if sub.radius and sub.systems is None]
+        if self.bot.gates is None:
+            if radius_subs:
+                log.warning(f'Universe data failed to load, {len(radius_subs)} radius killmail subs '
+                            f'will match nothing until the bot is restarted.')
+            return
+        for sub in radius_subs:
+            self.set_radius_systems(sub)
 
     async def prepare_subs(self):
         await self.bot.wait_until_ready()
         log.debug("Preparing killmail subs.")
 
+        await db.add_column('add_kills', 'radius', 'INTEGER DEFAULT 0')
         killboard_subs = await self.get_subs()
         for sub_data in killboard_subs:
-            id_, channel_id, _, losses, threshold, group_id = sub_data
+            id_, channel_id, _, losses, threshold, group_id, radius = sub_data
             channel = self.bot.get_channel(channel_id)
             if not channel:
                 await self.remove_bad_channel(channel_id)
 
-            sub = Subscription(id_, channel, threshold, convert_to_bool(losses), group_id)
+            sub = Subscription(id_, channel, threshold, convert_to_bool(losses), group_id, radius)
             self.subs[sub.id] = sub
 
+        self.update_min_threshold()
+        self.bot.loop.create_task(self.prepare_radius_subs())
         self.ws_task = self.bot.loop.create_task(self.listen_for_mails())
 
+    def update_min_threshold(self):
+        """Keep the lowest threshold of all subs, mails under it can't match anything."""
+        self.min_threshold = min((sub.threshold or 0 for sub in self.subs.values()), default=0)
+
     def process_mail(self, killmail_data):
-        killmail_data['killmail']['zkb'] = killmail_data['zkb']
-        mail = Mail(killmail_data['killmail'], self.bot.esi_data)
-        if mail.npc:
+        zkb = killmail_data['zkb']
+        if zkb.get('npc') or not self.subs:
+            return
+        if (zkb.get('totalValue') or 0) < self.min_threshold:
             return
+        killmail_data['killmail']['zkb'] = zkb
+        mail = Mail(killmail_data['killmail'], self.bot.esi_data)
+        if self.bot.locations is not None and mail.system_id in self.bot.locations:
+            location = self.bot.locations.data(mail.system_id)
+            mail.constellation_id = location.constellation_id
+            mail.region_id = location.region_id
         asyncio.gather(*[sub.mail(mail) for sub in self.subs.values()])
 
     async def listen_for_mails(self):
@@ -79,7 +121,7 @@ class Killmail(commands.Cog):
         while True:
             try:
                 await self.get_new_mail()
-            except (json.JSONDecodeError, KeyError):
+            except (codec.DecodeError, KeyError):
                 log.exception("Killmail data was badly formed.")
                 pass
             except aiohttp.ClientError:
@@ -89,8 +131,8 @@ class Killmail(commands.Cog):
     async def get_new_mail(self):
         url = f"https://redisq.zkillboard.com/listen.php?queueID=firetail_{self.bot.user.id}"
         async with self.bot.session.get(url) as resp:
-            data = await resp.json()
-            log.debug(json.dumps(data['package'], indent=4))
+            data = await resp.json(loads=codec.loads)
+            log.debug('%s', codec.pretty(data['package']))
         if data['package']:
             self.km_counter += 1
             self.process_mail(data['package'])
@@ -111,13 +153,15 @@ class Killmail(commands.Cog):
 
         subs = []
         for sub_data in subs_data:
-            id_, _, _, losses, threshold, group_id = sub_data
+            id_, _, _, losses, threshold, group_id, radius = sub_data
             sub_text = f"`{id_}`: Kills"
             if convert_to_bool(losses):
                 sub_text += " and Losses"
             if threshold:
                 sub_text += f" over {threshold:,} ISK"
-            if group_id and group_id != 6:
+            if radius:
+                sub_text += f" within {radius} jumps of system {group_id}"
+            elif group_id and group_id != 6:
                 sub_text += f" matching ID {group_id}"
             subs.append(sub_text)
 
@@ -128,15 +172,36 @@ class Killmail(commands.Cog):
 
     @checks.is_mod()
     @killmail.group(name="add", aliases=["sub"], invoke_without_command=True)
-    async def add_killmail(self, ctx, match_id: int, threshold: Optional[int], include_losses: bool = False):
+    async def add_killmail(
+        self, ctx, match_id: int, threshold: Optional[int], include_losses: Optional[bool] = False, *,
+        options: str = ''
+    ):
         """
         Add a new killmail subscription to the channel.
 
         `match_id` can be an Alliance ID, Corp ID, Region ID, System ID (Use Zkill or Dotlan to get them)
+        Add `--radius N` with a System ID to get kills within N gate jumps of that system.
         """
 
+        radius = 0
+        match = RADIUS_OPTION.search(options)
+        if match:
+            radius = int(match.group(1))
+            if not 0 < radius <= MAX_RADIUS:
+                await ctx.error(f"Radius must be between 1 and {MAX_RADIUS} jumps.")
+                return
+            if self.bot.gates is None:
+                if self.bot.sde_ready.is_set():
+                    await ctx.error("Universe data couldn't be loaded, radius subscriptions are unavailable.")
+                else:
+                    await ctx.error("Universe data is still loading, try again in a few minutes.")
+                return
+            if match_id not in self.bot.gates:
+                await ctx.error(f"ID {match_id} is not a system with stargates.")
+                return
+
         losses = 'true' if include_losses else 'false'
-        await self.add_sub(ctx.channel.id, ctx.guild.id, ctx.author.id, match_id, losses, threshold)
+        await self.add_sub(ctx.channel.id, ctx.guild.id, ctx.author.id, match_id, losses, threshold, radius)
         await ctx.success("Killmail subscription added!")
 
     @checks.is_mod()
@@ -167,7 +232,7 @@ class Killmail(commands.Cog):
                 await ctx.error(f"ID {sub_id} does not match any of your killmail subscriptions.")
                 return
 
-            id_, channel_id, server_id, losses, threshold, group_id = sub
+            id_, channel_id, server_id, losses, threshold, group_id, radius = sub
             if server_id != ctx.guild.id:
                 await ctx.error(f"ID {sub_id} does not match any of your killmail subscriptions.")
                 return
@@ -175,6 +240,7 @@ class Killmail(commands.Cog):
             sql = "DELETE FROM add_kills WHERE id = (?)"
             await db.execute_sql(sql, (sub_id,))
             del self.subs[sub_id]
+            self.update_min_threshold()
             await ctx.success(f'Killmail {sub_id} has been removed.')
             return
 
@@ -187,6 +253,7 @@ class Killmail(commands.Cog):
                 rm_ids.append(sub.id)
         for rm_id in rm_ids:
             del self.subs[rm_id]
+        self.update_min_threshold()
 
         await ctx.success(
             "All killmail subs removed for this channel.",
@@ -207,3 +274,5 @@ class Killmail(commands.Cog):
 
     def cog_unload(self):
         self.ws_task.cancel()
+        self.bot.metrics.remove_gauge('firetail_killmail_subscriptions')
+        self.bot.metrics.remove_gauge('firetail_killmails_received')
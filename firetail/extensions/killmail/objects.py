@@ -16,10 +16,9 @@ class Position(NamedTuple):
 
 
 class Item:
-    __slots__ = ('_data', '_esi', 'flag', 'item_type_id', 'qty_dropped', 'qty_destroyed', 'singleton', 'name')
+    __slots__ = ('_esi', 'flag', 'item_type_id', 'qty_dropped', 'qty_destroyed', 'singleton', 'name')
 
     def __init__(self, data, esi):
-        self._data = data
         self._esi = esi
         self.flag = data.get('flag')
         self.item_type_id = data.get('item_type_id')
@@ -34,10 +33,9 @@ class Item:
 
 
 class Character:
-    __slots__ = ('_data', '_esi', 'id', 'corp_id', 'alliance_id', 'ship_type_id', 'name', 'corp', 'alliance', 'ship')
+    __slots__ = ('_esi', 'id', 'corp_id', 'alliance_id', 'ship_type_id', 'name', 'corp', 'alliance', 'ship')
 
     def __init__(self, data, esi):
-        self._data = data
         self._esi = esi
         self.id = data.get('character_id')
         self.corp_id = data.get('corporation_id')
@@ -106,42 +104,60 @@ class Attacker(Character):
 
 
 class Victim(Character):
-    __slots__ = ('damage_taken', 'items', 'position', *Character.__slots__)
+    __slots__ = ('damage_taken', '_item_data', '_items', 'position', *Character.__slots__)
 
     def __init__(self, data, esi):
         super().__init__(data, esi)
         self.damage_taken = data.get('damage_taken')
-        self.items = [Item(i, esi) for i in data.get('items', [])]
+        self._item_data = data.get('items', [])
+        self._items = None
         pos = data.get('position')
         if pos:
             self.position = Position(**pos)
 
+    @property
+    def items(self):
+        if self._items is None:
+            self._items = [Item(i, self._esi) for i in self._item_data]
+        return self._items
+
 
 class Mail:
+    """A killmail from zKillboard.
+
+    Only the ids needed to match subscriptions are read up front, the
+    victim and attacker objects are built when first used, which is
+    normally only for mails that get posted.
+    """
+
     __slots__ = (
-        '_data', '_esi', 'id', 'time', 'system_id', 'final_attacker', 'attackers', 'victim', 'corp_id', 'alliance_id',
-        'location_id', 'hash', 'fitted_value', 'value', 'points', 'npc', 'solo', 'awox', 'eve_url', 'url', 'system',
-        'celestial', 'constellation', 'constellation_id', 'region_id', 'region'
+        '_data', '_esi', 'id', '_time', 'system_id', '_final_attacker', '_attackers', '_victim', 'corp_id',
+        'alliance_id', 'attacker_group_ids', 'location_id', 'hash', 'fitted_value', 'value', 'points', 'npc', 'solo',
+        'awox', 'eve_url', 'url', 'system', 'celestial', 'constellation', 'constellation_id', 'region_id', 'region'
     )
 
     def __init__(self, payload, esi):
         self._data = payload
         self._esi = esi
         self.id = payload.get('killmail_id')
-        self.time = parse(payload.get('killmail_time'))
+        self._time = None
         self.system_id = payload.get('solar_system_id')
 
-        self.final_attacker = None
-        self.attackers = {}
-        for attacker_data in payload.get("attackers", []):
-            attacker = Attacker(attacker_data, esi)
-            self.attackers[attacker.id] = attacker
-            if attacker.final_blow:
-                self.final_attacker = attacker
+        self._final_attacker = None
+        self._attackers = None
+        self._victim = None
 
-        self.victim = Victim(payload.get('victim'), esi)
-        self.corp_id = self.victim.corp_id
-        self.alliance_id = self.victim.alliance_id
+        victim = payload.get('victim', {})
+        self.corp_id = victim.get('corporation_id')
+        self.alliance_id = victim.get('alliance_id')
+
+        # corp and alliance ids don't overlap, so one set covers both
+        group_ids = set()
+        for attacker in payload.get('attackers', ()):
+            group_ids.add(attacker.get('corporation_id'))
+            group_ids.add(attacker.get('alliance_id'))
+        group_ids.discard(None)
+        self.attacker_group_ids = frozenset(group_ids)
 
         zkb = payload.get('zkb', {})
         self.location_id = zkb.get('locationID')
@@ -162,6 +178,43 @@ class Mail:
         self.region_id = None
         self.region = None
 
+    @property
+    def time(self):
+        if self._time is None:
+            self._time = parse(self._data.get('killmail_time'))
+        return self._time
+
+    @property
+    def victim(self):
+        if self._victim is None:
+            self._victim = Victim(self._data.get('victim', {}), self._esi)
+        return self._victim
+
+    @property
+    def attackers(self):
+        if self._attackers is None:
+            self._attackers = {}
+            for attacker_data in self._data.get('attackers', ()):
+                if attacker_data.get('final_blow') and self._final_attacker is not None:
+                    attacker = self._final_attacker
+                else:
+                    attacker = Attacker(attacker_data, self._esi)
+                self._attackers[attacker.id] = attacker
+                if attacker.final_blow:
+                    self._final_attacker = attacker
+        return self._attackers
+
+    @property
+    def final_attacker(self):
+        if self._final_attacker is None:
+            if self._attackers is not None:
+                return None
+            for attacker_data in self._data.get('attackers', ()):
+                if attacker_data.get('final_blow'):
+                    self._final_attacker = Attacker(attacker_data, self._esi)
+                    break
+        return self._final_attacker
+
     def __repr__(self):
         sys = self.system_id
         victim = self.victim.id
@@ -236,9 +289,11 @@ class Mail:
 
 
 class Subscription:
-    __slots__ = ('id', 'channel', 'losses', 'threshold', 'group_id')
+    __slots__ = ('id', 'channel', 'losses', 'threshold', 'group_id', 'radius', 'systems')
 
-    def __init__(self, id_: int, channel, threshold: int = None, losses: bool = True, group_id: int = None):
+    def __init__(
+        self, id_: int, channel, threshold: int = None, losses: bool = True, group_id: int = None, radius: int = 0
+    ):
         self.id = id_
         self.channel = channel
 
@@ -247,13 +302,19 @@ class Subscription:
 
         self.group_id = group_id if group_id != 6 else None
 
+        # radius subs match kills within `radius` gate jumps of the group_id system,
+        # `systems` is filled in once the gate graph is loaded
+        self.radius = radius or 0
+        self.systems = None
+
     def __repr__(self):
         id_ = self.id
         chan = self.channel
         th = self.threshold
         loss = f" losses={self.losses}" if self.losses else ""
         grp = f"group_id={self.group_id}" if self.group_id else ""
-        return f"<Subscription {id_} channel={chan} threshold={th}{loss}{grp}>"
+        rad = f" radius={self.radius}" if self.radius else ""
+        return f"<Subscription {id_} channel={chan} threshold={th}{loss}{grp}{rad}>"
 
     async def mail(self, killmail: Mail):
         if await self.valid(killmail):
@@ -271,20 +332,20 @@ class Subscription:
         if not self.group_id:
             return True
 
+        if self.radius:
+            return self.systems is not None and killmail.system_id in self.systems
+
         if self.group_id == killmail.system_id:
             return True
 
         if self.losses and self.group_id in [killmail.corp_id, killmail.alliance_id]:
             return True
 
-        if any(a.corp_id == self.group_id for a in killmail.attackers.values()):
-            return True
-
-        if any(a.alliance_id == self.group_id for a in killmail.attackers.values()):
+        if self.group_id in killmail.attacker_group_ids:
             return True
 
         if not killmail.region_id:
-            await killmail.fetch_celestial()
+            await killmail.fetch_constellation()
         if self.group_id == killmail.region_id:
             return True
 
@@ -4,6 +4,7 @@ import operator
 from discord.ext import commands
 
 from firetail.core import checks
+from firetail.lib.sde import CONSTELLATION, REGION, SYSTEM, rounded_security
 from firetail.utils import make_embed
 
 log = logging.getLogger(__name__)
@@ -34,7 +35,12 @@ class LocationScout(commands.Cog):
         log.info(f'Scout - {ctx.author} requested information for {location}')
         if data is None:
             dest = ctx.author if ctx.bot.config.dm_only else ctx
-            return await dest.send(f'**ERROR:** Could not find a location named {location}')
+            msg = f'**ERROR:** Could not find a location named {location}'
+            if self.bot.locations is not None:
+                suggestions = self.bot.locations.suggest(location)
+                if suggestions:
+                    msg += '\nDid you mean: {}?'.format(', '.join(suggestions))
+            return await dest.send(msg)
         if location_type == 'system':
             await self.format_system(ctx, data)
         elif location_type == 'constellation':
@@ -43,6 +49,8 @@ class LocationScout(commands.Cog):
             await self.format_region(ctx, data)
 
     async def get_data(self, location):
+        if self.bot.locations is not None:
+            return await self.get_indexed_data(location)
         data = await self.bot.esi_data.esi_search(location, 'solar_system')
         if data is not None and data is not False and 'solar_system' in data:
             location_type = 'system'
@@ -66,13 +74,26 @@ class LocationScout(commands.Cog):
                 else:
                     return None, None
 
+    async def get_indexed_data(self, location):
+        location_id = self.bot.locations.match(location)
+        if location_id is None:
+            return None, None
+        kind = self.bot.locations.data(location_id).kind
+        if kind == SYSTEM:
+            return await self.bot.esi_data.system_info(location_id), 'system'
+        if kind == REGION:
+            return await self.bot.esi_data.region_info(location_id), 'region'
+        if kind == CONSTELLATION:
+            return await self.bot.esi_data.constellation_info(location_id), 'constellation'
+        return None, None
+
     async def format_system(self, ctx, data):
         async with ctx.channel.typing():
             sov_alliance_id = 1
             sov_corp = 'N/A'
             sov_alliance = 'N/A'
             name = data['name']
-            security_status = round(data['security_status'], 1)
+            security_status = rounded_security(data['security_status'])
             constellation_id = data['constellation_id']
             constellation_data = await self.bot.esi_data.constellation_info(constellation_id)
             constellation_name = constellation_data['name']
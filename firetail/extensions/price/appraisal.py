@@ -0,0 +1,172 @@
+"""Parsing and pricing of pasted item lists.
+
+Handles EFT fittings, cargo scans and tab separated inventory or
+contract lists, including a mix of them in a single paste.
+
+Run ``python -m firetail.extensions.price.appraisal`` to benchmark
+parsing and pricing of large pastes.
+"""
+import argparse
+import random
+import re
+import time
+from collections import OrderedDict
+
+QUANTITY_SUFFIX = re.compile(r'^(?P<name>.+?)\s+x\s?(?P<quantity>[\d,.]+)$')
+QUANTITY_PREFIX = re.compile(r'^(?P<quantity>[\d,.]+)\s*x?\s+(?P<name>.+)$')
+EFT_HEADER = re.compile(r'^\[(?P<ship>[^,\]]+),[^\]]*\]$')
+# whole numbers, optionally grouped in thousands by commas or by dots
+WHOLE_NUMBER = re.compile(r'^(?:\d+|\d{1,3}(?:,\d{3})+|\d{1,3}(?:\.\d{3})+)$')
+
+
+class Appraisal:
+    __slots__ = ('lines', 'unknown', 'buy', 'sell')
+
+    def __init__(self, lines, unknown):
+        self.lines = lines
+        self.unknown = unknown
+        self.buy = sum(line[3] for line in lines)
+        self.sell = sum(line[4] for line in lines)
+
+
+def quantity(text):
+    """Whole number quantity, or None if `text` isn't one.
+
+    Commas and dots are only accepted as thousands separators, so
+    decimals aren't mistaken for larger quantities.
+
+    >>> quantity('1,000'), quantity('1.000'), quantity('12')
+    (1000, 1000, 12)
+    >>> quantity('1.5'), quantity('1,5'), quantity('1.000,50')
+    (None, None, None)
+    """
+    text = text.strip()
+    if WHOLE_NUMBER.match(text) is None:
+        return None
+    return int(text.replace(',', '').replace('.', ''))
+
+
+def parse_line(line):
+    """Returns a (name, quantity) tuple, or None for lines to skip."""
+    line = line.strip()
+    if not line:
+        return None
+    if line[0] == '[':
+        header = EFT_HEADER.match(line)
+        if header is None:
+            # empty slot markers like [Empty High slot]
+            return None
+        return header.group('ship').strip(), 1
+    if '\t' in line:
+        columns = line.split('\t')
+        amount = quantity(columns[1]) if len(columns) > 1 and columns[1] else 1
+        return columns[0].strip(), amount or 1
+    if line.endswith('/OFFLINE'):
+        line = line[:-8].rstrip()
+    match = QUANTITY_SUFFIX.match(line)
+    if match is None:
+        match = QUANTITY_PREFIX.match(line)
+    if match is not None:
+        amount = quantity(match.group('quantity'))
+        if amount is not None:
+            return match.group('name').strip(), amount
+    # EFT modules with a loaded charge, only the module is counted
+    return line.split(',', 1)[0].strip(), 1
+
+
+def parse(text):
+    """Parse a paste into an ordered dict of item name to total quantity.
+
+    Names are grouped case insensitively, keeping the first spelling.
+    """
+    items = OrderedDict()
+    names = {}
+    for line in text.splitlines():
+        parsed = parse_line(line)
+        if parsed is None:
+            continue
+        name, amount = parsed
+        key = name.lower()
+        name = names.setdefault(key, name)
+        items[name] = items.get(name, 0) + amount
+    return items
+
+
+def price_items(items, types, aggregates):
+    """Price parsed items.
+
+    `types` maps lowercased names to (type_id, type_name) and
+    `aggregates` maps type_id to Fuzzwork aggregate data. Lines are
+    (type_name, type_id, quantity, buy value, sell value) sorted by
+    sell value.
+    """
+    lines = []
+    unknown = []
+    for name, amount in items.items():
+        resolved = types.get(name.lower())
+        if resolved is None:
+            unknown.append(name)
+            continue
+        type_id, type_name = resolved
+        data = aggregates.get(type_id)
+        buy = float(data['buy']['max']) if data else 0.0
+        sell = float(data['sell']['min']) if data else 0.0
+        lines.append((type_name, type_id, amount, buy * amount, sell * amount))
+    lines.sort(key=lambda line: line[4], reverse=True)
+    return Appraisal(lines, unknown)
+
+
+async def appraise(market, text, station):
+    """Parse and price a paste with one name lookup and one price request."""
+    items = parse(text)
+    if not items:
+        return None
+    types = await market.resolve_many(items)
+    aggregates = await market.aggregates({type_id for type_id, _ in types.values()}, station)
+    return price_items(items, types, aggregates)
+
+
+def _paste(lines, rng):
+    names = [f'Item {i}' for i in range(lines // 4 or 1)]
+    formats = (
+        lambda name: f'{name}\t{rng.randint(1, 100000):,}\tCommodity\t\t\t100 m3',
+        lambda name: f'{rng.randint(1, 500)} {name}',
+        lambda name: f'{name} x{rng.randint(1, 50)}',
+        lambda name: f'{name}, Charge {rng.randint(1, 5)}',
+    )
+    return '\n'.join(rng.choice(formats)(rng.choice(names)) for _ in range(lines))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark appraisal parsing and pricing.')
+    parser.add_argument('--lines', type=int, default=1000, help='lines per paste')
+    parser.add_argument('--runs', type=int, default=200, help='number of pastes to appraise')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    text = _paste(args.lines, rng)
+    types = {}
+    aggregates = {}
+    for type_id, name in enumerate(parse(text), 1):
+        types[name.lower()] = type_id, name
+        price = rng.uniform(1, 1e6)
+        aggregates[type_id] = {'buy': {'max': str(price * 0.9)}, 'sell': {'min': str(price)}}
+
+    start = time.perf_counter()
+    for _ in range(args.runs):
+        items = parse(text)
+    parse_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(args.runs):
+        result = price_items(items, types, aggregates)
+    price_time = time.perf_counter() - start
+
+    print(f'{args.runs} pastes of {args.lines} lines ({len(items)} distinct items)')
+    print(f'parse: {parse_time / args.runs * 1000:.3f} ms/paste')
+    print(f'price: {price_time / args.runs * 1000:.3f} ms/paste')
+    print(f'total sell value: {result.sell:,.2f} ISK')
+
+
+if __name__ == '__main__':
+    main()
@@ -3,17 +3,15 @@ import logging
 from discord.ext import commands
 
 from firetail.core import checks
+from firetail.lib.market import DEFAULT_HUB, HUBS
 from firetail.utils import make_embed
+from .appraisal import appraise
 
 log = logging.getLogger(__name__)
 
-HUBS = {
-    'jita': 60003760,
-    'amarr': 60008494,
-    'dodixie': 60011866,
-    'rens': 60004588,
-    'hek': 60005686
-}
+APPRAISAL_LINES = 15
+UNKNOWN_NAME_LENGTH = 50
+FIELD_LIMIT = 1024
 
 
 class Price(commands.Cog):
@@ -48,36 +46,28 @@ class Price(commands.Cog):
                 return await ctx.channel.send(msg)
 
         async with ctx.typing():
-            if ctx.invoked_with not in ["pc", "price"]:
-                lookup = ctx.invoked_with.title()
-            else:
-                lookup = 'Jita'
+            hub = ctx.invoked_with.lower() if ctx.invoked_with.lower() in HUBS else DEFAULT_HUB
+            lookup = hub.title()
 
             log.info(f'Price - {ctx.author} requested price information for {item}')
 
-            data = await ctx.bot.esi_data.market_data(item, HUBS.get(ctx.invoked_with, 60003760))
+            result = await ctx.bot.market.price(item, hub)
 
-            if not data:
-                if data is None:
-                    log.info(f'Price - {item} could not be found')
-                    embed = await ctx.error(f"'{item}' not found", "Are you sure it's an item?", send=False)
-                if data is False:
-                    log.info(f'Price - {item} multiple items found')
-                    embed = await ctx.error(
-                        f"'{item}' matched multiple items",
-                        "Please try again with more a more specific query.",
-                        send=False
-                    )
+            if not result:
+                log.info(f'Price - {item} could not be found')
+                suggestions = ctx.bot.market.suggest(item)
+                if suggestions:
+                    details = "Did you mean: {}?".format(', '.join(suggestions))
+                else:
+                    details = "Are you sure it's an item?"
+                embed = await ctx.error(f"'{item}' not found", details, send=False)
 
                 if ctx.bot.config.dm_only:
                     return await ctx.author.send(embed=embed)
 
                 return await ctx.channel.send(embed=embed)
 
-            type_id_raw = await ctx.bot.esi_data.esi_search(item, 'inventory_type')
-            type_id = type_id_raw['inventory_type'][0]
-            type_name_raw = await ctx.bot.esi_data.item_info(type_id)
-            type_name = type_name_raw['name']
+            type_id, type_name, data = result
             buymax = '{0:,.2f}'.format(float(data['buy']['max']))
             buymin = '{0:,.2f}'.format(float(data['buy']['min']))
             buyavg = '{0:,.2f}'.format(float(data['buy']['weightedAverage']))
@@ -124,3 +114,55 @@ class Price(commands.Cog):
                 await ctx.channel.send(embed=em)
             if ctx.bot.config.delete_commands:
                 await ctx.message.delete()
+
+    @commands.command(aliases=["appraisal"])
+    @checks.spam_check()
+    @checks.is_whitelist()
+    async def appraise(self, ctx, *, paste: str):
+        """Gets the value of a pasted fit, cargo scan or inventory list.
+
+        Use **!appraise** followed by the paste on new lines. Put a hub name
+        first (**!appraise amarr**) to price somewhere other than Jita.
+        """
+        first, _, rest = paste.partition('\n')
+        if first.strip().lower() in HUBS:
+            hub, paste = first.strip().lower(), rest
+        else:
+            hub = DEFAULT_HUB
+
+        async with ctx.typing():
+            log.info(f'Price - {ctx.author} requested an appraisal at {hub}')
+            result = await appraise(ctx.bot.market, paste, HUBS[hub])
+
+            if not result or not result.lines:
+                embed = await ctx.error("Nothing to appraise", "No known items were found in the paste.", send=False)
+                if ctx.bot.config.dm_only:
+                    return await ctx.author.send(embed=embed)
+                return await ctx.channel.send(embed=embed)
+
+            lines = [
+                f"{quantity:,} x {name} - {sell:,.2f}"
+                for name, _, quantity, _, sell in result.lines[:APPRAISAL_LINES]
+            ]
+            if len(result.lines) > APPRAISAL_LINES:
+                lines.append(f"...and {len(result.lines) - APPRAISAL_LINES} more")
+            em = make_embed(
+                title=f"{hub.title()} Appraisal",
+                content='\n'.join(lines),
+                guild=ctx.guild
+            )
+            em.set_footer(text="Pricing data sourced from Fuzzworks Market API")
+            em.add_field(name="Buy", value=f"{result.buy:,.2f}", inline=True)
+            em.add_field(name="Sell", value=f"{result.sell:,.2f}", inline=True)
+            if result.unknown:
+                unknown = ', '.join(
+                    name if len(name) <= UNKNOWN_NAME_LENGTH else name[:UNKNOWN_NAME_LENGTH - 3] + '...'
+                    for name in result.unknown[:APPRAISAL_LINES]
+                )
+                if len(result.unknown) > APPRAISAL_LINES:
+                    unknown += f" and {len(result.unknown) - APPRAISAL_LINES} more"
+                em.add_field(name="Unknown Items", value=unknown[:FIELD_LIMIT], inline=False)
+            if ctx.bot.config.dm_only:
+                await ctx.author.send(embed=em)
+            else:
+                await ctx.channel.send(embed=em)
@@ -0,0 +1,5 @@
+from .route_planner import RoutePlanner
+
+
+def setup(bot):
+    bot.add_cog(RoutePlanner(bot))
@@ -0,0 +1,70 @@
+import logging
+
+from discord.ext import commands
+
+from firetail.core import checks
+from firetail.lib.sde import is_system, rounded_security
+
+log = logging.getLogger(__name__)
+
+
+class RoutePlanner(commands.Cog):
+    """This extension handles gate routes."""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    def find_system(self, name):
+        return self.bot.locations.match(name, where=is_system)
+
+    @commands.command()
+    @checks.spam_check()
+    @checks.is_whitelist()
+    async def route(self, ctx, origin, destination, *avoid):
+        """
+        Provides the shortest gate route between two systems.
+
+        '!route Jita Amarr' Gives you the shortest route.
+        '!route Jita Amarr Niarja Uedama' avoids the listed systems.
+        """
+
+        log.info(f'RoutePlanner - {ctx.message.author} requested a route from {origin} to {destination}.')
+
+        if self.bot.locations is None or self.bot.gates is None:
+            await ctx.dest.send('**ERROR:** Universe data is still loading, try again in a minute.')
+            return
+
+        systems = []
+        for name in (origin, destination, *avoid):
+            system_id = self.find_system(name)
+            if system_id is None:
+                suggestions = self.bot.locations.suggest(name, where=is_system)
+                hint = ' Did you mean: {}?'.format(', '.join(suggestions)) if suggestions else ''
+                await ctx.dest.send(f'**ERROR:** No system found with the name {name}.{hint}')
+                return
+            systems.append(system_id)
+
+        origin_id, destination_id, *avoid_ids = systems
+        route = self.bot.gates.route(origin_id, destination_id, avoid_ids)
+        if route is None:
+            await ctx.dest.send('**ERROR:** No gate route found between those systems.')
+            return
+
+        names = [self.bot.locations.name(system_id) for system_id in route]
+        lines = []
+        for jump, system_id in enumerate(route):
+            location = self.bot.locations.data(system_id)
+            lines.append(f'{jump}: {location.name} ({rounded_security(location.security):.1f})')
+        if len(lines) > 50:
+            lines = lines[:25] + [f'...{len(lines) - 50} more...'] + lines[-25:]
+        url = f'http://evemaps.dotlan.net/route/{names[0]}:{names[-1]}'.replace(' ', '_')
+        embed = await ctx.embed(
+            f"{names[0]} to {names[-1]} - {len(route) - 1} jumps",
+            '\n'.join(lines),
+            icon="https://pbs.twimg.com/profile_images/1145561069/dotlan-avatar_400x400.png",
+            title_url=url,
+            send=False
+        )
+        await ctx.dest.send(embed=embed)
+        if ctx.bot.config.delete_commands:
+            await ctx.message.delete()
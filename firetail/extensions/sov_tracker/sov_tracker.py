@@ -7,6 +7,7 @@ from discord.ext import commands
 
 from firetail.core import checks
 from firetail.lib import db
+from firetail.lib.sde import is_system
 from firetail.utils import make_embed
 
 log = logging.getLogger(__name__)
@@ -127,6 +128,11 @@ class SovTracker(commands.Cog):
         await ctx.dest.send(f"No longer tracking sov battles in {system_data['name']}")
 
     async def get_data(self, location):
+        if self.bot.locations is not None:
+            system_id = self.bot.locations.match(location, where=is_system)
+            if system_id is None:
+                return None
+            return self.bot.locations.data(system_id).system_info()
         search = 'solar_system'
         data = await self.bot.esi_data.esi_search(location, search)
         if data is None or data is False:
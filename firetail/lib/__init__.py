@@ -1 +1,9 @@
+from .disk_cache import DiskCache
 from .esi import ESI
+from .gates import GateGraph
+from .killmails import KillmailStore
+from .market import Market
+from .names import NameIndex
+from .resolver import Resolver
+from .sde import SDE
+from .zkill import ZKill
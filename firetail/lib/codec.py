@@ -0,0 +1,56 @@
+"""JSON encoding and decoding.
+
+Uses orjson or ujson when one is installed and falls back to the
+standard library. Every backend raises a ValueError subclass on bad
+input, so callers catch `DecodeError`.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+DecodeError = ValueError
+
+
+def _orjson_dumps(obj):
+    return orjson.dumps(obj).decode()
+
+
+def _ujson_loads(data):
+    if isinstance(data, (bytes, bytearray)):
+        data = data.decode()
+    return ujson.loads(data)
+
+
+BACKENDS = {'json': (json.loads, json.dumps)}
+if ujson is not None:
+    BACKENDS['ujson'] = (_ujson_loads, ujson.dumps)
+if orjson is not None:
+    BACKENDS['orjson'] = (orjson.loads, _orjson_dumps)
+
+BACKEND = next(name for name in ('orjson', 'ujson', 'json') if name in BACKENDS)
+loads, dumps = BACKENDS[BACKEND]
+
+
+class pretty:
+    """Indented dump of `data`, only built when formatted.
+
+    Pass it as a logging argument, ``log.debug('%s', pretty(data))``, and
+    nothing is serialized unless the record is actually emitted.
+    """
+
+    __slots__ = ('data',)
+
+    def __init__(self, data):
+        self.data = data
+
+    def __str__(self):
+        return json.dumps(self.data, indent=4)
+
@@ -7,8 +7,16 @@ from functools import wraps
 logger = logging.getLogger('firetail.db')
 
 DATABASE = 'firetail.sqlite'
-LOCK = asyncio.Lock()
 HERE = os.path.dirname(__file__)
+_lock = None
+
+
+def get_lock():
+    """The db lock, made on first use so it belongs to the loop the bot runs on."""
+    global _lock
+    if _lock is None:
+        _lock = asyncio.Lock()
+    return _lock
 
 
 def db_access(func):
@@ -47,7 +55,7 @@ def db_access(func):
 
     @wraps(func)
     async def access_control(*args, db=None, **kwargs):
-        async with LOCK:
+        async with get_lock():
             if not db:
                 db = get_db()
             try:
@@ -80,6 +88,42 @@ def create_tables(*, db=None):
     db.commit()
 
 
+@db_access
+def add_column(table, column, definition, *, db=None):
+    """Adds a column to an existing table if it isn't already present.
+
+    Used for migrating databases created before a column was added to
+    ``tables.sql``.
+
+    Access is controlled with a coroutine wrapper, so this function
+    must be awaited when used.
+
+    Parameters
+    ----------
+    table: `str`
+        Name of the table to alter.
+    column: `str`
+        Name of the column to add.
+    definition: `str`
+        Column type and constraints, as used in ``ALTER TABLE``.
+    db: `sqlite.Connection`, optional
+        The sqlite database connection. Not required, unless not using
+        the default database for Firetail.
+
+    Returns
+    -------
+    bool
+        `True` if the column was added, `False` if it already existed.
+    """
+    cursor = db.cursor()
+    cursor.execute(f"PRAGMA table_info({table})")
+    if any(row[1] == column for row in cursor.fetchall()):
+        return False
+    cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    db.commit()
+    return True
+
+
 @db_access
 def select(sql, single=False, *, db=None):
     """Executes a given select query to the sqlite database.
@@ -183,3 +227,32 @@ def execute_sql(sql, var=None, *, db=None):
     cursor.execute(sql, var)
     db.commit()
     return cursor.lastrowid
+
+
+@db_access
+def execute_many(sql, var_list, *, db=None):
+    """Executes a given query to the sqlite database once for each set
+    of placeholder variables, committing them in a single transaction.
+
+    Access is controlled with a coroutine wrapper, so this function
+    must be awaited when used.
+
+    Parameters
+    ----------
+    sql: `str`
+        SQL statement to be executed.
+    var_list: Iterable[`tuple`]
+        Iterable of tuples of values to replace placeholders.
+    db: `sqlite.Connection`, optional
+        The sqlite database connection. Not required, unless not using
+        the default database for Firetail.
+
+    Returns
+    -------
+    int
+        The number of rows modified.
+    """
+    cursor = db.cursor()
+    cursor.executemany(sql, var_list)
+    db.commit()
+    return cursor.rowcount
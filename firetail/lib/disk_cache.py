@@ -0,0 +1,89 @@
+import logging
+import sqlite3
+import time
+
+from . import codec
+
+log = logging.getLogger(__name__)
+
+CACHE_FILE = 'esi_cache.sqlite'
+BUSY_TIMEOUT = 0.05  # seconds to wait on another process's write before giving up
+
+
+class DiskCache:
+    """Persistent key value store for API responses, with expiry.
+
+    Backed by its own sqlite file in WAL mode, so any number of bot
+    processes can read and write the same cache at once and a restart
+    starts with everything still cached. Values are stored as JSON
+    with an absolute expiry time; expired entries are ignored on read
+    and removed by `purge`.
+
+    Lookups are primary key reads and writes are single row upserts,
+    so they're done inline rather than through the `db` lock. They only
+    wait briefly for another process's write to finish, so the loop is
+    never held up; a locked database counts as a miss and the write is
+    skipped.
+    """
+
+    def __init__(self, path=CACHE_FILE, timer=time.time):
+        self.path = path
+        self._timer = timer
+        self._db = sqlite3.connect(path, timeout=5, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL)"
+        )
+        self._db.execute(f"PRAGMA busy_timeout = {int(BUSY_TIMEOUT * 1000)}")
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return self._db.execute("SELECT COUNT(*) FROM cache WHERE expires > ?", (self._timer(),)).fetchone()[0]
+
+    def get(self, key, default=None):
+        try:
+            row = self._db.execute(
+                "SELECT value FROM cache WHERE key = ? AND expires > ?", (key, self._timer())
+            ).fetchone()
+        except sqlite3.OperationalError:
+            log.debug(f'Disk cache busy, unable to read {key}.', exc_info=True)
+            row = None
+        except sqlite3.Error:
+            log.exception(f'Unable to read {key} from the disk cache.')
+            row = None
+        if row is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return codec.loads(row[0])
+
+    def set(self, key, value, ttl):
+        try:
+            self._db.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+                (key, codec.dumps(value), self._timer() + ttl)
+            )
+        except sqlite3.OperationalError:
+            log.debug(f'Disk cache busy, unable to write {key}.', exc_info=True)
+        except sqlite3.Error:
+            log.exception(f'Unable to write {key} to the disk cache.')
+
+    def pop(self, key):
+        try:
+            self._db.execute("DELETE FROM cache WHERE key = ?", (key,))
+        except sqlite3.OperationalError:
+            log.debug(f'Disk cache busy, unable to remove {key}.', exc_info=True)
+
+    def purge(self):
+        """Remove expired entries, returning how many were removed."""
+        try:
+            return self._db.execute("DELETE FROM cache WHERE expires <= ?", (self._timer(),)).rowcount
+        except sqlite3.OperationalError:
+            log.warning('Disk cache busy, expired entries will be purged next time.')
+            return 0
+
+    def close(self):
+        self._db.close()
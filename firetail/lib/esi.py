@@ -1,18 +1,24 @@
-import json
+import asyncio
 
 import aiohttp
 
+from . import codec
+
 ESI_URL = "https://esi.evetech.net/latest"
 FUZZ_URL = "https://www.fuzzwork.co.uk/api"
 MARKET_URL = "https://market.fuzzwork.co.uk/aggregates"
 OAUTH_URL = "https://login.eveonline.com/oauth/verify"
 
+# universe data only changes with game updates
+UNIVERSE_TTL = 30 * 24 * 60 * 60
+
 
 class ESI:
     """Data manager for requesting and returning ESI data."""
 
-    def __init__(self, session):
+    def __init__(self, session, cache=None):
         self.session = session
+        self.cache = cache
         self._types_cache = {}
         self._celestial_cache = {}
         self._system_cache = {}
@@ -25,13 +31,25 @@ class ESI:
         self._moon_cache = {}
         self._asteroid_cache = {}
 
-    async def get_data(self, url):
-        """Base data retrieval method."""
+    async def get_data(self, url, ttl=None):
+        """Base data retrieval method.
+
+        If `ttl` is given and the ESI has a disk cache, successful
+        responses are kept there for `ttl` seconds and served from it
+        until they expire.
+        """
+        cached = ttl is not None and self.cache is not None
+        if cached:
+            data = self.cache.get(url)
+            if data is not None:
+                return data
         async with self.session.get(url, headers={"Accepts": "application/json"}) as r:
             try:
-                data = await r.json(content_type=None)
-            except json.JSONDecodeError:
+                data = await r.json(content_type=None, loads=codec.loads)
+            except codec.DecodeError:
                 return None
+        if cached and r.status == 200:
+            self.cache.set(url, data, ttl)
         return data
 
     async def server_info(self):
@@ -99,11 +117,11 @@ class ESI:
 
     async def system_info(self, system_id):
         url = f'{ESI_URL}/universe/systems/{system_id}/'
-        return await self.get_data(url)
+        return await self.get_data(url, UNIVERSE_TTL)
 
     async def system_name(self, system_id):
         url = f'{ESI_URL}/universe/systems/{system_id}/'
-        data = await self.get_data(url)
+        data = await self.get_data(url, UNIVERSE_TTL)
         if not data:
             return None
         return data.get('name')
@@ -114,7 +132,7 @@ class ESI:
                 return self._constellation_cache[constellation_id]
 
         url = f'{ESI_URL}/universe/constellations/{constellation_id}/'
-        data = await self.get_data(url)
+        data = await self.get_data(url, UNIVERSE_TTL)
         if data:
             self._constellation_cache[constellation_id] = data
         return data
@@ -125,7 +143,7 @@ class ESI:
                 return self._region_cache[region_id]
 
         url = f'{ESI_URL}/universe/regions/{region_id}/'
-        data = await self.get_data(url)
+        data = await self.get_data(url, UNIVERSE_TTL)
         if data:
             self._region_cache[region_id] = data
         return data
@@ -136,7 +154,7 @@ class ESI:
                 return self._planet_cache[planet_id]
 
         url = f'{ESI_URL}/universe/planets/{planet_id}/'
-        data = await self.get_data(url)
+        data = await self.get_data(url, UNIVERSE_TTL)
         if data:
             self._planet_cache[planet_id] = data
         return data
@@ -147,7 +165,7 @@ class ESI:
                 return self._moon_cache[moon_id]
 
         url = f'{ESI_URL}/universe/moons/{moon_id}/'
-        data = await self.get_data(url)
+        data = await self.get_data(url, UNIVERSE_TTL)
         if data:
             self._moon_cache[moon_id] = data
         return data
@@ -158,7 +176,7 @@ class ESI:
                 return self._asteroid_cache[asteroid_id]
 
         url = f'{ESI_URL}/universe/asteroid_belts/{asteroid_id}/'
-        data = await self.get_data(url)
+        data = await self.get_data(url, UNIVERSE_TTL)
         if data:
             self._asteroid_cache[asteroid_id] = data
         return data
@@ -169,7 +187,7 @@ class ESI:
                 return self._stargate_cache[stargate_id]
 
         url = f'{ESI_URL}/universe/stargates/{stargate_id}/'
-        data = await self.get_data(url)
+        data = await self.get_data(url, UNIVERSE_TTL)
         if data:
             self._stargate_cache[stargate_id] = data
         return data
@@ -180,7 +198,7 @@ class ESI:
                 return self._star_cache[star_id]
 
         url = f'{ESI_URL}/universe/stars/{star_id}/'
-        data = await self.get_data(url)
+        data = await self.get_data(url, UNIVERSE_TTL)
         if data:
             self._star_cache[star_id] = data
         return data
@@ -191,7 +209,7 @@ class ESI:
                 return self._station_cache[station_id]
 
         url = f'{ESI_URL}/universe/stations/{station_id}/'
-        data = await self.get_data(url)
+        data = await self.get_data(url, UNIVERSE_TTL)
         if data:
             self._station_cache[station_id] = data
         return data
@@ -259,12 +277,37 @@ class ESI:
             return None
         return data.get('typeID')
 
+    async def universe_ids(self, names):
+        """Resolve a list of exact names to ids in as few requests as possible.
+
+        ESI accepts up to 500 names per request, larger lists are split and
+        requested concurrently. Returns the combined category dict.
+        """
+        url = f'{ESI_URL}/universe/ids/?datasource=tranquility&language=en-us'
+        names = list(names)
+
+        async def post(chunk):
+            async with self.session.post(url, json=chunk) as r:
+                if r.status != 200:
+                    return {}
+                try:
+                    return await r.json(content_type=None, loads=codec.loads)
+                except codec.DecodeError:
+                    return {}
+
+        results = await asyncio.gather(*[post(names[i:i + 500]) for i in range(0, len(names), 500)])
+        data = {}
+        for result in results:
+            for category, matches in result.items():
+                data.setdefault(category, []).extend(matches)
+        return data
+
     async def item_info(self, item_id, allow_cache=True):
         if allow_cache:
             if item_id in self._types_cache:
                 return self._types_cache[item_id]
         url = f'{ESI_URL}/universe/types/{item_id}/'
-        data = await self.get_data(url)
+        data = await self.get_data(url, UNIVERSE_TTL)
         if data:
             self._types_cache[item_id] = data
         return data
@@ -292,7 +335,7 @@ class ESI:
         sess = self.session
         async with sess.get(OAUTH_URL, params=params, headers=header) as r:
             try:
-                data = await r.json()
+                data = await r.json(loads=codec.loads)
             except aiohttp.ContentTypeError:
                 return None
             return data
@@ -302,7 +345,7 @@ class ESI:
 
         async with self.session.get(OAUTH_URL, headers=header) as r:
             try:
-                data = await r.json()
+                data = await r.json(loads=codec.loads)
             except aiohttp.ContentTypeError:
                 return None
             return data
@@ -0,0 +1,162 @@
+from array import array
+from functools import lru_cache
+
+UNREACHABLE = -1
+
+
+class GateGraph:
+    """Stargate connections between systems.
+
+    The graph is stored in compressed sparse row form: system `i`'s
+    neighbours are ``neighbours[offsets[i]:offsets[i + 1]]``, where
+    indexes map to system ids through `ids`. Hop distances from a
+    system are computed with a breadth first search and the most
+    recently used are cached, so repeated routes to or from the same
+    system are a walk down the cached distances.
+    """
+
+    def __init__(self, connections, cache_size=256):
+        adjacency = {}
+        for origin, destination in connections:
+            adjacency.setdefault(origin, set()).add(destination)
+            adjacency.setdefault(destination, set()).add(origin)
+        self.ids = array('l', sorted(adjacency))
+        self.index = {system_id: i for i, system_id in enumerate(self.ids)}
+        self.offsets = array('l', [0])
+        self.neighbours = array('l')
+        for system_id in self.ids:
+            self.neighbours.extend(sorted(self.index[n] for n in adjacency[system_id]))
+            self.offsets.append(len(self.neighbours))
+        self._distances = lru_cache(maxsize=cache_size)(self._search)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, system_id):
+        return system_id in self.index
+
+    def _adjacent(self, i):
+        return self.neighbours[self.offsets[i]:self.offsets[i + 1]]
+
+    def _search(self, start):
+        distances = array('h', [UNREACHABLE]) * len(self.ids)
+        distances[start] = 0
+        frontier = [start]
+        hops = 0
+        offsets = self.offsets
+        neighbours = self.neighbours
+        while frontier:
+            hops += 1
+            found = []
+            for i in frontier:
+                for n in neighbours[offsets[i]:offsets[i + 1]]:
+                    if distances[n] == UNREACHABLE:
+                        distances[n] = hops
+                        found.append(n)
+            frontier = found
+        return distances
+
+    def distances(self, system_id):
+        """Gate jumps from `system_id` to each system, in `ids` order.
+
+        Unreachable systems are `UNREACHABLE`.
+        """
+        return self._distances(self.index[system_id])
+
+    def jumps(self, origin, destination):
+        """Number of gate jumps between two systems, or None."""
+        if origin not in self.index or destination not in self.index:
+            return None
+        hops = self.distances(origin)[self.index[destination]]
+        return None if hops == UNREACHABLE else hops
+
+    def within(self, system_id, jumps):
+        """Dict of system id to gate jumps for systems within `jumps` of `system_id`."""
+        if system_id not in self.index:
+            return {}
+        ids = self.ids
+        return {
+            ids[i]: hops for i, hops in enumerate(self.distances(system_id))
+            if UNREACHABLE < hops <= jumps
+        }
+
+    def route(self, origin, destination, avoid=None):
+        """Shortest gate route as a list of system ids, or None.
+
+        Systems in `avoid` are never passed through, although the origin
+        and destination themselves are always allowed.
+        """
+        if origin not in self.index or destination not in self.index:
+            return None
+        start = self.index[origin]
+        end = self.index[destination]
+        if start == end:
+            return [origin]
+        if avoid:
+            blocked = {self.index[system_id] for system_id in avoid if system_id in self.index}
+            blocked.discard(start)
+            blocked.discard(end)
+            path = self._bidirectional(start, end, blocked)
+        else:
+            path = self._walk(start, end)
+        if path is None:
+            return None
+        return [self.ids[i] for i in path]
+
+    def _walk(self, start, end):
+        """Follow the cached distances to `end` down from `start`."""
+        distances = self._distances(end)
+        hops = distances[start]
+        if hops == UNREACHABLE:
+            return None
+        path = [start]
+        current = start
+        while hops:
+            hops -= 1
+            for n in self._adjacent(current):
+                if distances[n] == hops:
+                    current = n
+                    break
+            path.append(current)
+        return path
+
+    def _bidirectional(self, start, end, blocked):
+        """Breadth first search from both ends, expanding the smaller side.
+
+        Each pass expands a whole level, and the best meeting point in
+        that level gives the shortest route.
+        """
+        parents = ({start: None}, {end: None})
+        depths = ({start: 0}, {end: 0})
+        frontiers = ([start], [end])
+        while frontiers[0] and frontiers[1]:
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            seen, depth, other = parents[side], depths[side], depths[1 - side]
+            found = []
+            best = None
+            for i in frontiers[side]:
+                for n in self._adjacent(i):
+                    if n in blocked:
+                        continue
+                    if n in other:
+                        total = depth[i] + 1 + other[n]
+                        if best is None or total < best[0]:
+                            best = total, i, n
+                    if n not in seen:
+                        seen[n] = i
+                        depth[n] = depth[i] + 1
+                        found.append(n)
+            if best is not None:
+                _, i, n = best
+                near, far = (i, n) if side == 0 else (n, i)
+                path = []
+                while near is not None:
+                    path.append(near)
+                    near = parents[0][near]
+                path.reverse()
+                while far is not None:
+                    path.append(far)
+                    far = parents[1][far]
+                return path
+            frontiers = (found, frontiers[1]) if side == 0 else (frontiers[0], found)
+        return None
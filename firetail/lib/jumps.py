@@ -0,0 +1,162 @@
+import heapq
+from functools import lru_cache
+from math import ceil, sqrt
+
+from .sde import SYSTEM, rounded_security
+from .spatial import KDTree
+
+LIGHT_YEAR = 9460730472580800  # metres
+
+# base jump range in light years by ship group, before Jump Drive Calibration
+JUMP_RANGES = {
+    30: 3.5,  # Titan
+    485: 3.5,  # Dreadnought
+    547: 3.5,  # Carrier
+    659: 3.5,  # Supercarrier
+    1538: 3.5,  # Force Auxiliary
+    898: 4.0,  # Black Ops
+    902: 5.0,  # Jump Freighter
+}
+
+WORMHOLE_SYSTEMS = 31000000
+POCHVEN = 10000070
+JOVE_REGIONS = {10000004, 10000017, 10000019}
+
+# small allowance so systems right on the edge of range aren't dropped by rounding
+EPSILON = 1e-9
+
+
+def jump_range(group_id, jdc_level=5):
+    """Jump range in light years, or None if the group can't jump."""
+    base = JUMP_RANGES.get(group_id)
+    if base is None:
+        return None
+    return round(base * (1 + 0.2 * jdc_level), 2)
+
+
+def is_known_space(location):
+    return location.kind == SYSTEM and location.id < WORMHOLE_SYSTEMS
+
+
+def is_jump_destination(location):
+    """Whether a capital can light a cyno and jump into the system."""
+    return (
+        is_known_space(location)
+        and rounded_security(location.security) < 0.5
+        and location.region_id != POCHVEN
+        and location.region_id not in JOVE_REGIONS
+    )
+
+
+class JumpMap:
+    """Jump routes over known space systems.
+
+    Coordinates are kept in light years and destinations in a k-d tree.
+    The systems in range of a system are cached per jump range, so
+    routes planned for the same ship class reuse each other's work and
+    repeated range lookups are free.
+    """
+
+    def __init__(self, locations, cache_size=8192):
+        self.positions = {}
+        self.regions = {}
+        self.security = {}  # as the game rounds it
+        destinations = []
+        for location in locations:
+            if not is_known_space(location):
+                continue
+            position = location.x / LIGHT_YEAR, location.y / LIGHT_YEAR, location.z / LIGHT_YEAR
+            self.positions[location.id] = position
+            self.regions[location.id] = location.region_id
+            self.security[location.id] = rounded_security(location.security)
+            if is_jump_destination(location):
+                destinations.append((*position, location.id))
+        self.destinations = frozenset(point[3] for point in destinations)
+        self.tree = KDTree(destinations)
+        self.in_range = lru_cache(maxsize=cache_size)(self._in_range)
+        self.reachable = lru_cache(maxsize=cache_size // 8)(self._reachable)
+
+    def distance(self, origin, destination):
+        """Distance in light years, or None if either system is outside known space."""
+        if origin not in self.positions or destination not in self.positions:
+            return None
+        ax, ay, az = self.positions[origin]
+        bx, by, bz = self.positions[destination]
+        return sqrt((ax - bx) ** 2 + (ay - by) ** 2 + (az - bz) ** 2)
+
+    def _in_range(self, system_id, max_range):
+        """Destinations within `max_range` as ``(system_id, distance)``, nearest first."""
+        x, y, z = self.positions[system_id]
+        return tuple(
+            (destination, distance)
+            for distance, destination in sorted(self.tree.within(x, y, z, max_range + EPSILON))
+            if destination != system_id
+        )
+
+    def _reachable(self, system_id, max_range):
+        """Destinations in range grouped by region.
+
+        Returns ``(region_id, systems)`` pairs with `systems` as in
+        `in_range`, regions ordered by their nearest system.
+        """
+        regions = {}
+        for destination, distance in self.in_range(system_id, max_range):
+            regions.setdefault(self.regions[destination], []).append((destination, distance))
+        return tuple((region_id, tuple(systems)) for region_id, systems in regions.items())
+
+    def route(self, origin, destination, max_range):
+        """Shortest route by jumps, then by distance travelled.
+
+        Returns a list of ``(system_id, distance)`` pairs starting with
+        the origin at distance 0, or None if the destination can't be
+        reached.
+        """
+        if origin == destination:
+            return [(origin, 0.0)]
+        if destination not in self.destinations or origin not in self.positions:
+            return None
+
+        def estimate(system_id):
+            remaining = self.distance(system_id, destination)
+            return ceil(remaining / max_range - EPSILON), remaining
+
+        best = {origin: (0, 0.0)}
+        previous = {}
+        jumps, distance = estimate(origin)
+        queue = [(jumps, distance, 0, 0.0, origin)]
+        while queue:
+            _, _, jumps, travelled, system_id = heapq.heappop(queue)
+            if system_id == destination:
+                break
+            if best[system_id] < (jumps, travelled):
+                continue
+            for neighbour, distance in self.in_range(system_id, max_range):
+                cost = (jumps + 1, travelled + distance)
+                if neighbour in best and best[neighbour] <= cost:
+                    continue
+                best[neighbour] = cost
+                previous[neighbour] = system_id, distance
+                remaining_jumps, remaining = estimate(neighbour)
+                heapq.heappush(queue, (cost[0] + remaining_jumps, cost[1] + remaining, cost[0], cost[1], neighbour))
+        else:
+            return None
+
+        route = []
+        system_id = destination
+        while system_id != origin:
+            before, distance = previous[system_id]
+            route.append((system_id, distance))
+            system_id = before
+        route.append((origin, 0.0))
+        route.reverse()
+        return route
+
+    def plan(self, waypoints, max_range):
+        """Route through each waypoint in order, None if any leg fails."""
+        route = [(waypoints[0], 0.0)]
+        for origin, destination in zip(waypoints, waypoints[1:]):
+            leg = self.route(origin, destination, max_range)
+            if leg is None:
+                return None
+            route.extend(leg[1:])
+        return route
@@ -0,0 +1,102 @@
+import asyncio
+import logging
+from collections import OrderedDict
+
+import aiohttp
+
+from . import codec, db
+from .esi import ESI_URL
+
+log = logging.getLogger(__name__)
+
+
+class KillmailStore:
+    """Killmails from ESI, kept permanently.
+
+    A killmail never changes once its id and hash are known, so every
+    one fetched is saved to the ``killmails`` table and the most
+    recently used are also kept in memory. Misses are fetched from ESI
+    concurrently, at most `concurrency` at a time.
+    """
+
+    def __init__(self, session, maxsize=2048, concurrency=10):
+        self.session = session
+        self.maxsize = maxsize
+        self._cache = OrderedDict()
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    def __len__(self):
+        return len(self._cache)
+
+    def _remember(self, key, killmail):
+        self._cache[key] = killmail
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+
+    async def get(self, killmail_id, killmail_hash):
+        """A single killmail, or None if it couldn't be retrieved."""
+        killmails = await self.get_many([(killmail_id, killmail_hash)])
+        return killmails[0]
+
+    async def get_many(self, refs):
+        """Killmails for a list of ``(killmail_id, hash)`` pairs.
+
+        Returns a list in the same order, with None for any killmail
+        that couldn't be retrieved.
+        """
+        refs = [(int(killmail_id), killmail_hash) for killmail_id, killmail_hash in refs]
+        found = {}
+        for key in refs:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                found[key] = self._cache[key]
+
+        missing = list({key for key in refs if key not in found})
+        if missing:
+            stored = await self._load(missing)
+            for key, killmail in stored.items():
+                self._remember(key, killmail)
+            found.update(stored)
+            missing = [key for key in missing if key not in stored]
+
+        if missing:
+            fetched = await asyncio.gather(*[self._fetch(*key) for key in missing])
+            new = []
+            for key, killmail in zip(missing, fetched):
+                if killmail is None:
+                    continue
+                self._remember(key, killmail)
+                found[key] = killmail
+                new.append((key[0], key[1], codec.dumps(killmail)))
+            if new:
+                sql = "INSERT OR IGNORE INTO killmails (killmail_id, hash, data) VALUES (?, ?, ?)"
+                await db.execute_many(sql, new)
+
+        return [found.get(key) for key in refs]
+
+    async def _load(self, keys):
+        stored = {}
+        wanted = set(keys)
+        ids = sorted({killmail_id for killmail_id, _ in keys})
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            sql = f"SELECT killmail_id, hash, data FROM killmails WHERE killmail_id IN ({', '.join('?' * len(chunk))})"
+            rows = await db.select_var(sql, tuple(chunk)) or []
+            for killmail_id, killmail_hash, data in rows:
+                if (killmail_id, killmail_hash) in wanted:
+                    stored[(killmail_id, killmail_hash)] = codec.loads(data)
+        return stored
+
+    async def _fetch(self, killmail_id, killmail_hash):
+        url = f'{ESI_URL}/killmails/{killmail_id}/{killmail_hash}/?datasource=tranquility'
+        async with self._semaphore:
+            try:
+                async with self.session.get(url) as r:
+                    if r.status != 200:
+                        log.debug(f'Killmail {killmail_id} request failed with status {r.status}.')
+                        return None
+                    return await r.json(content_type=None, loads=codec.loads)
+            except (aiohttp.ClientError, asyncio.TimeoutError, codec.DecodeError):
+                log.debug(f'Killmail {killmail_id} request failed.', exc_info=True)
+                return None
@@ -0,0 +1,137 @@
+import asyncio
+import logging
+
+from firetail.utils.cache import TTLCache
+from .esi import MARKET_URL
+
+log = logging.getLogger(__name__)
+
+HUBS = {
+    'jita': 60003760,
+    'amarr': 60008494,
+    'dodixie': 60011866,
+    'rens': 60004588,
+    'hek': 60005686
+}
+DEFAULT_HUB = 'jita'
+
+
+class Market:
+    """Cached market data from the Fuzzwork aggregates API.
+
+    Aggregates are cached per (station, type_id) for `ttl` seconds.
+    Searches and exact item names are only resolved to a type once.
+    """
+
+    def __init__(self, esi, ttl=300):
+        self.esi = esi
+        self._aggregates = TTLCache(ttl, maxsize=50000)
+        self._types = {}
+        self._searches = {}
+        self.types = None
+
+    def __len__(self):
+        return len(self._aggregates)
+
+    async def resolve(self, item_name):
+        """Returns a (type_id, type_name) tuple, or None if not found.
+
+        Uses the local type index when it's loaded and ESI search until then.
+        """
+        if self.types is not None:
+            type_id = self.types.match(item_name)
+            if type_id is None:
+                return None
+            return type_id, self.types.name(type_id)
+        key = item_name.strip().lower()
+        if key in self._searches:
+            return self._searches[key]
+        results = await self.esi.esi_search(item_name, 'inventory_type')
+        if not results:
+            return None
+        type_id = results['inventory_type'][0]
+        info = await self.esi.item_info(type_id)
+        if not info:
+            return None
+        self._searches[key] = type_id, info['name']
+        return self._searches[key]
+
+    async def resolve_many(self, item_names):
+        """Resolve exact item names in one batch.
+
+        Returns a dict of lowercased name to (type_id, type_name); names
+        that don't match an item are left out.
+        """
+        found = {}
+        missing = []
+        for name in item_names:
+            key = name.strip().lower()
+            if self.types is not None:
+                type_id = self.types.exact(key)
+                if type_id is not None:
+                    found[key] = type_id, self.types.name(type_id)
+                continue
+            if key in self._types:
+                found[key] = self._types[key]
+            elif key not in found:
+                missing.append(name.strip())
+        if missing:
+            data = await self.esi.universe_ids(missing)
+            for match in data.get('inventory_types', []):
+                key = match['name'].lower()
+                found[key] = self._types[key] = match['id'], match['name']
+        return found
+
+    def suggest(self, item_name, limit=5):
+        """Item names similar to `item_name`, empty if the index isn't loaded."""
+        if self.types is None:
+            return []
+        return self.types.suggest(item_name, limit)
+
+    async def aggregates(self, type_ids, station):
+        """Returns a dict of type_id to aggregate data at `station`.
+
+        Types that aren't cached are fetched together in one request.
+        """
+        found = {}
+        missing = []
+        for type_id in set(type_ids):
+            data = self._aggregates.get((station, type_id))
+            if data is None:
+                missing.append(type_id)
+            else:
+                found[type_id] = data
+        if missing:
+            types = ','.join(str(type_id) for type_id in sorted(missing))
+            data = await self.esi.get_data(f'{MARKET_URL}/?station={station}&types={types}')
+            if not data:
+                log.info(f'Market - No aggregates returned for {len(missing)} types at {station}')
+                return found
+            for type_id in missing:
+                item = data.get(str(type_id))
+                if item is not None:
+                    self._aggregates.set((station, type_id), item)
+                    found[type_id] = item
+        return found
+
+    async def hub_aggregates(self, type_ids):
+        """Returns aggregates for every trade hub, keyed by hub name."""
+        results = await asyncio.gather(*[self.aggregates(type_ids, station) for station in HUBS.values()])
+        return dict(zip(HUBS, results))
+
+    async def price(self, item_name, hub=DEFAULT_HUB):
+        """Returns (type_id, type_name, aggregate) for an item at a hub.
+
+        All hubs are fetched at once so that following lookups at other
+        hubs are served from the cache. Returns None if the item can't
+        be resolved or has no market data.
+        """
+        resolved = await self.resolve(item_name)
+        if resolved is None:
+            return None
+        type_id, type_name = resolved
+        hubs = await self.hub_aggregates([type_id])
+        data = hubs.get(hub, {}).get(type_id)
+        if data is None:
+            return None
+        return type_id, type_name, data
@@ -0,0 +1,121 @@
+from bisect import bisect_left
+from collections import Counter
+
+
+def trigrams(text):
+    text = f' {text} '
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class NameIndex:
+    """In-memory index for resolving names to ids.
+
+    Built once from ``(id, name, data)`` entries and read only after.
+    Matching is case insensitive and goes from exact names, to name
+    prefixes, to trigram similarity for misspelt names. Lookups accept
+    an optional `where` predicate that is called with the entry data.
+    """
+
+    def __init__(self, entries=()):
+        self._names = {}
+        self._data = {}
+        self._exact = {}
+        keys = []
+        for entry_id, name, data in entries:
+            key = name.casefold()
+            self._names[entry_id] = name
+            self._data[entry_id] = data
+            self._exact.setdefault(key, entry_id)
+            keys.append((key, entry_id))
+        keys.sort()
+        self._keys = keys
+        self._grams = {}
+        for position, (key, _) in enumerate(keys):
+            for gram in trigrams(key):
+                self._grams.setdefault(gram, []).append(position)
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, entry_id):
+        return entry_id in self._names
+
+    def items(self):
+        """All ``(id, data)`` pairs in the index."""
+        return self._data.items()
+
+    def name(self, entry_id):
+        return self._names.get(entry_id)
+
+    def data(self, entry_id):
+        return self._data.get(entry_id)
+
+    def _keep(self, entry_id, where):
+        return where is None or where(self._data[entry_id])
+
+    def _scan(self, query, where=None):
+        """Yield (key, id) pairs for names starting with `query` in key order."""
+        keys = self._keys
+        for i in range(bisect_left(keys, (query,)), len(keys)):
+            key, entry_id = keys[i]
+            if not key.startswith(query):
+                break
+            if self._keep(entry_id, where):
+                yield key, entry_id
+
+    def exact(self, query, where=None):
+        query = query.strip().casefold()
+        entry_id = self._exact.get(query)
+        if entry_id is None or self._keep(entry_id, where):
+            return entry_id
+        # another entry with the same name might pass the filter
+        for key, entry_id in self._scan(query, where):
+            if key == query:
+                return entry_id
+        return None
+
+    def prefix(self, query, limit=None, where=None):
+        """Ids of names starting with `query`, shortest names first."""
+        query = query.strip().casefold()
+        if not query:
+            return []
+        matches = sorted((len(key), key, entry_id) for key, entry_id in self._scan(query, where))
+        return [entry_id for _, _, entry_id in matches[:limit]]
+
+    def fuzzy(self, query, limit=5, cutoff=0.25, where=None):
+        """Ids of the names most similar to `query`, best first."""
+        query = query.strip().casefold()
+        grams = trigrams(query)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._grams.get(gram, ()))
+        scored = []
+        for position, count in shared.items():
+            key, entry_id = self._keys[position]
+            if not self._keep(entry_id, where):
+                continue
+            score = 2 * count / (len(grams) + len(key))
+            if score >= cutoff:
+                scored.append((-score, len(key), entry_id))
+        scored.sort()
+        return [entry_id for _, _, entry_id in scored[:limit]]
+
+    def match(self, query, where=None):
+        """Returns the id for an exact or unambiguous prefix match."""
+        entry_id = self.exact(query, where)
+        if entry_id is not None:
+            return entry_id
+        query = query.strip().casefold()
+        if not query:
+            return None
+        matches = []
+        for _, entry_id in self._scan(query, where):
+            matches.append(entry_id)
+            if len(matches) > 1:
+                return None
+        return matches[0] if matches else None
+
+    def suggest(self, query, limit=5, where=None):
+        """Names to offer when `query` didn't match anything."""
+        matches = self.prefix(query, limit, where) or self.fuzzy(query, limit, where=where)
+        return list(dict.fromkeys(self._names[entry_id] for entry_id in matches))
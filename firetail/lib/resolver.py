@@ -0,0 +1,136 @@
+import asyncio
+import logging
+
+from firetail.utils.cache import TTLCache
+
+log = logging.getLogger(__name__)
+
+# search categories and their keys in /universe/ids/ results
+ID_CATEGORIES = {
+    'agent': 'agents',
+    'alliance': 'alliances',
+    'character': 'characters',
+    'constellation': 'constellations',
+    'corporation': 'corporations',
+    'faction': 'factions',
+    'inventory_type': 'inventory_types',
+    'region': 'regions',
+    'solar_system': 'systems',
+    'station': 'stations',
+}
+
+# ESI methods giving the details of a search candidate
+INFO_METHODS = {
+    'alliance': 'alliance_info',
+    'character': 'character_info',
+    'constellation': 'constellation_info',
+    'corporation': 'corporation_info',
+    'inventory_type': 'item_info',
+    'region': 'region_info',
+    'solar_system': 'system_info',
+    'station': 'station_info',
+}
+
+MAX_CANDIDATES = 20
+POSITIVE_TTL = 6 * 60 * 60
+NEGATIVE_TTL = 10 * 60
+
+_MISSING = object()
+
+
+def normalize(name):
+    return ' '.join(name.lower().split())
+
+
+class Resolver:
+    """Resolves names to ids by category.
+
+    Exact names are resolved in bulk with ``/universe/ids/``, and only
+    the names it doesn't know are searched for. When a search gives
+    several candidates their details are fetched concurrently and an
+    exact name match is picked. Both found and missing names are
+    cached, missing ones for a shorter time.
+    """
+
+    def __init__(self, esi, maxsize=5000):
+        self.esi = esi
+        self._cache = TTLCache(POSITIVE_TTL, maxsize=maxsize)
+
+    def __len__(self):
+        return len(self._cache)
+
+    def peek(self, name, category):
+        """Cached id for a name, without making any requests."""
+        found = self._cache.get((category, normalize(name)))
+        return found or None
+
+    def _remember(self, category, name, found):
+        if found is None:
+            self._cache.set((category, normalize(name)), 0, ttl=NEGATIVE_TTL)
+        else:
+            self._cache.set((category, normalize(name)), found)
+
+    async def resolve(self, name, *categories):
+        """Id for a name in a category, or None if it can't be found.
+
+        With several categories, returns a dict of category to id.
+        """
+        results = await self.resolve_many([name], *categories)
+        found = {category: ids[normalize(name)] for category, ids in results.items()}
+        return found if len(categories) > 1 else found[categories[0]]
+
+    async def resolve_many(self, names, *categories):
+        """Ids for a list of names.
+
+        Returns a dict of category to a dict of normalized name to id,
+        or None for names that couldn't be found.
+        """
+        keys = {normalize(name): name for name in names}
+        results = {category: {} for category in categories}
+        missing = {}
+        for category in categories:
+            for key, name in keys.items():
+                found = self._cache.get((category, key), _MISSING)
+                if found is _MISSING:
+                    missing.setdefault(key, name)
+                else:
+                    results[category][key] = found or None
+
+        if missing:
+            data = await self.esi.universe_ids(list(missing.values()))
+            for category in categories:
+                for match in data.get(ID_CATEGORIES[category], []):
+                    key = normalize(match['name'])
+                    self._remember(category, key, match['id'])
+                    if key in missing:
+                        results[category][key] = match['id']
+
+        searches = [
+            (category, key) for category in categories for key in missing
+            if key not in results[category] and category in INFO_METHODS
+        ]
+        found = await asyncio.gather(*[self._search(missing[key], category) for category, key in searches])
+        for (category, key), match in zip(searches, found):
+            self._remember(category, key, match)
+            results[category][key] = match
+
+        for category in categories:
+            for key in keys:
+                results[category].setdefault(key, None)
+        return results
+
+    async def _search(self, name, category):
+        """Search for a partial name, picking an exact match if there's several."""
+        data = await self.esi.esi_search(name, category)
+        if not data or category not in data:
+            return None
+        ids = data[category]
+        if len(ids) == 1:
+            return ids[0]
+        info = getattr(self.esi, INFO_METHODS[category])
+        details = await asyncio.gather(*[info(eve_id) for eve_id in ids[:MAX_CANDIDATES]])
+        key = normalize(name)
+        for eve_id, detail in zip(ids, details):
+            if detail and normalize(detail.get('name', '')) == key:
+                return eve_id
+        return None
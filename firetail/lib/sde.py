@@ -0,0 +1,167 @@
+import asyncio
+import bz2
+import csv
+import logging
+import os
+from collections import namedtuple
+
+from .gates import GateGraph
+from .names import NameIndex
+
+log = logging.getLogger(__name__)
+
+SDE_URL = "https://www.fuzzwork.co.uk/dump/latest"
+SDE_DIR = 'sde'
+TABLES = ('invTypes', 'mapSolarSystems', 'mapConstellations', 'mapRegions', 'mapSolarSystemJumps')
+
+SYSTEM = 'solar_system'
+CONSTELLATION = 'constellation'
+REGION = 'region'
+
+
+class Location(namedtuple('Location', 'id name kind region_id constellation_id security x y z')):
+    """A system, constellation or region from the SDE map tables."""
+
+    __slots__ = ()
+
+    def system_info(self):
+        """The fields of ESI's system info that the SDE also has."""
+        return {
+            'system_id': self.id,
+            'name': self.name,
+            'constellation_id': self.constellation_id,
+            'security_status': self.security,
+            'position': {'x': self.x, 'y': self.y, 'z': self.z},
+        }
+
+
+class SDE:
+    """Local snapshot of Static Data Export tables.
+
+    Tables are kept as the compressed CSV dumps published by Fuzzwork
+    and are only downloaded again when the Tranquility server version
+    changes.
+    """
+
+    def __init__(self, session, esi, path=SDE_DIR, tables=TABLES):
+        self.session = session
+        self.esi = esi
+        self.path = path
+        self.tables = tables
+        self.version = None
+
+    def table_path(self, table):
+        return os.path.join(self.path, f'{table}.csv.bz2')
+
+    @property
+    def version_path(self):
+        return os.path.join(self.path, 'version')
+
+    def _read_version(self):
+        try:
+            with open(self.version_path) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    async def update(self):
+        """Download tables that are missing or out of date.
+
+        Returns True if anything was downloaded.
+        """
+        os.makedirs(self.path, exist_ok=True)
+        self.version = self._read_version()
+        status = await self.esi.server_info()
+        latest = str(status['server_version']) if status and 'server_version' in status else None
+        if latest is not None and latest != self.version:
+            outdated = list(self.tables)
+        else:
+            outdated = [table for table in self.tables if not os.path.exists(self.table_path(table))]
+        if not outdated:
+            return False
+        log.info(f'SDE - Downloading {", ".join(outdated)} for version {latest}')
+        await asyncio.gather(*[self.download(table) for table in outdated])
+        if latest is not None:
+            with open(self.version_path, 'w') as f:
+                f.write(latest)
+            self.version = latest
+        return True
+
+    async def download(self, table):
+        url = f'{SDE_URL}/{table}.csv.bz2'
+        async with self.session.get(url) as r:
+            r.raise_for_status()
+            data = await r.read()
+        path = self.table_path(table)
+        with open(f'{path}.tmp', 'wb') as f:
+            f.write(data)
+        os.replace(f'{path}.tmp', path)
+
+    def rows(self, table):
+        """Iterate over a table's rows as dicts of strings."""
+        with bz2.open(self.table_path(table), 'rt', encoding='utf-8', newline='') as f:
+            yield from csv.DictReader(f)
+
+    async def build(self, builder):
+        """Run ``builder(sde)`` in a thread so startup doesn't block the bot."""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, builder, self)
+
+
+def type_index(sde):
+    """Index of published type names, with the type's group id as data."""
+    return NameIndex(
+        (int(row['typeID']), row['typeName'], int(row['groupID']))
+        for row in sde.rows('invTypes') if row['published'] == '1'
+    )
+
+
+def location_index(sde):
+    """Index of systems, regions and constellations with `Location` data.
+
+    Systems are added first so that they win when names collide.
+    """
+    def entries():
+        for row in sde.rows('mapSolarSystems'):
+            system_id = int(row['solarSystemID'])
+            yield system_id, row['solarSystemName'], Location(
+                system_id, row['solarSystemName'], SYSTEM, int(row['regionID']), int(row['constellationID']),
+                float(row['security']), float(row['x']), float(row['y']), float(row['z'])
+            )
+        for row in sde.rows('mapRegions'):
+            region_id = int(row['regionID'])
+            yield region_id, row['regionName'], Location(
+                region_id, row['regionName'], REGION, region_id, None,
+                None, float(row['x']), float(row['y']), float(row['z'])
+            )
+        for row in sde.rows('mapConstellations'):
+            constellation_id = int(row['constellationID'])
+            yield constellation_id, row['constellationName'], Location(
+                constellation_id, row['constellationName'], CONSTELLATION, int(row['regionID']),
+                constellation_id, None, float(row['x']), float(row['y']), float(row['z'])
+            )
+    return NameIndex(entries())
+
+
+def gate_graph(sde):
+    """Stargate connections between systems."""
+    return GateGraph(
+        (int(row['fromSolarSystemID']), int(row['toSolarSystemID']))
+        for row in sde.rows('mapSolarSystemJumps')
+    )
+
+
+def rounded_security(security):
+    """Security status as the game rounds it, which decides high, low or null sec.
+
+    Rounded to one decimal place, except that anything above 0.0 counts
+    as at least 0.1.
+    """
+    if 0.0 < security < 0.05:
+        return 0.1
+    return round(security, 1) + 0.0  # no -0.0
+
+
+def is_system(location):
+    """`where` filter for location index lookups that only accept systems."""
+    return location.kind == SYSTEM
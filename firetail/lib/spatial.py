@@ -0,0 +1,54 @@
+from math import sqrt
+
+
+class KDTree:
+    """Static k-d tree over 3D points for radius queries.
+
+    Built once from ``(x, y, z, key)`` tuples. Nodes are stored as
+    ``(point, axis, left, right)`` tuples.
+    """
+
+    def __init__(self, points):
+        points = list(points)
+        self._size = len(points)
+        self._root = self._build(points, 0)
+
+    def __len__(self):
+        return self._size
+
+    def _build(self, points, depth):
+        if not points:
+            return None
+        axis = depth % 3
+        points.sort(key=lambda point: point[axis])
+        middle = len(points) // 2
+        return (
+            points[middle],
+            axis,
+            self._build(points[:middle], depth + 1),
+            self._build(points[middle + 1:], depth + 1),
+        )
+
+    def within(self, x, y, z, radius):
+        """Returns ``(distance, key)`` for every point within `radius`."""
+        found = []
+        limit = radius * radius
+        target = (x, y, z)
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            point, axis, left, right = node
+            dx = point[0] - x
+            dy = point[1] - y
+            dz = point[2] - z
+            squared = dx * dx + dy * dy + dz * dz
+            if squared <= limit:
+                found.append((sqrt(squared), point[3]))
+            offset = target[axis] - point[axis]
+            near, far = (left, right) if offset < 0 else (right, left)
+            stack.append(near)
+            if offset * offset <= limit:
+                stack.append(far)
+        return found
@@ -16,7 +16,8 @@ CREATE TABLE IF NOT EXISTS add_kills (
     groupid	INTEGER NOT NULL,
     ownerid INTEGER NOT NULL,
     losses TEXT NOT NULL,
-    threshold INTEGER NOT NULL
+    threshold INTEGER NOT NULL,
+    radius INTEGER DEFAULT 0
 );
 CREATE TABLE IF NOT EXISTS sov_tracker (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -41,7 +42,8 @@ CREATE TABLE IF NOT EXISTS eve_rpg_players (
     level INTEGER DEFAULT 0,
     xp INTEGER DEFAULT 0,
     ship TEXT DEFAULT NULL,
-    item TEXT DEFAULT NULL
+    item TEXT DEFAULT NULL,
+    items INTEGER DEFAULT 0
 );
 CREATE TABLE IF NOT EXISTS access_tokens (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -65,3 +67,9 @@ CREATE TABLE IF NOT EXISTS prefixes (
     guild_id INTEGER PRIMARY KEY,
     prefix TEXT NOT NULL
 );
+CREATE TABLE IF NOT EXISTS killmails (
+    killmail_id INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (killmail_id, hash)
+);
@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import time
+
+import aiohttp
+
+from firetail.utils.cache import TTLCache
+from . import codec
+
+log = logging.getLogger(__name__)
+
+ZKILL_API = 'https://zkillboard.com/api'
+HEADERS = {
+    'User-Agent': 'Firetail Discord Bot - https://github.com/scragly/Firetail',
+    'Accept-Encoding': 'gzip',
+}
+
+# seconds responses are reused for, by the first part of the path
+ENDPOINT_TTLS = {
+    'stats': 15 * 60,
+}
+DEFAULT_TTL = 5 * 60
+
+RATE = 2  # requests per second
+BURST = 10
+THROTTLED_BACKOFF = 60
+
+
+class ZKill:
+    """zKillboard API client.
+
+    Responses are cached for a time depending on the endpoint, and
+    concurrent requests for the same path share a single request.
+    Requests are spaced out to `rate` per second, with bursts of up to
+    `burst` allowed, and when zKill throttles us all requests stop
+    until it's willing to answer again.
+    """
+
+    def __init__(self, session, rate=RATE, burst=BURST, maxsize=1000):
+        self.session = session
+        self.interval = 1 / rate
+        self.burst = burst
+        self._cache = TTLCache(DEFAULT_TTL, maxsize=maxsize)
+        self._pending = {}
+        self._lock = asyncio.Lock()
+        self._next = 0
+        self._blocked_until = 0
+        self.requests = 0
+        self.hits = 0
+
+    def __len__(self):
+        return len(self._cache)
+
+    @property
+    def pending(self):
+        """Number of requests in flight or waiting on the rate limit."""
+        return len(self._pending)
+
+    async def get(self, *path):
+        """Response for an API path, or None if it couldn't be retrieved.
+
+        ``get('stats', 'characterID', 123)`` requests
+        ``/api/stats/characterID/123/``.
+        """
+        key = '/'.join(str(part) for part in path)
+        data = self._cache.get(key)
+        if data is not None:
+            self.hits += 1
+            return data
+        task = self._pending.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._request(key))
+            self._pending[key] = task
+            task.add_done_callback(lambda _: self._pending.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def stats(self, kind, entity_id):
+        """Stats for a character, corporation or alliance, or None if zKill has none.
+
+        `kind` is the zKill id type, such as ``characterID``.
+        """
+        data = await self.get('stats', kind, entity_id)
+        if isinstance(data, dict) and 'allTimeSum' in data:
+            return data
+        return None
+
+    async def mails(self, *path):
+        """Most recent mails for an API path, newest first.
+
+        ``mails('kills', 'characterID', 123, 'losses')`` gives a
+        character's losses. Returns an empty list if there are none.
+        """
+        data = await self.get(*path)
+        return data if isinstance(data, list) else []
+
+    async def _throttle(self):
+        async with self._lock:
+            now = time.monotonic()
+            start = max(self._next, now, self._blocked_until)
+            wait = max(self._blocked_until - now, start - now - (self.burst - 1) * self.interval)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._next = start + self.interval
+
+    async def _request(self, key):
+        await self._throttle()
+        url = f'{ZKILL_API}/{key}/'
+        self.requests += 1
+        try:
+            async with self.session.get(url, headers=HEADERS) as resp:
+                if resp.status in (420, 429):
+                    retry = resp.headers.get('Retry-After')
+                    backoff = int(retry) if retry and retry.isdigit() else THROTTLED_BACKOFF
+                    self._blocked_until = time.monotonic() + backoff
+                    log.warning(f'zKill throttled us, pausing requests for {backoff} seconds.')
+                    return None
+                if resp.status != 200:
+                    log.debug(f'zKill request {url} failed with status {resp.status}.')
+                    return None
+                data = await resp.json(content_type=None, loads=codec.loads)
+        except (aiohttp.ClientError, asyncio.TimeoutError, codec.DecodeError):
+            log.debug(f'zKill request {url} failed.', exc_info=True)
+            return None
+        if isinstance(data, dict) and 'error' in data:
+            return None
+        if data is not None:
+            self._cache.set(key, data, ENDPOINT_TTLS.get(key.split('/', 1)[0], DEFAULT_TTL))
+        return data
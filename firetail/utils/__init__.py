@@ -1,2 +1,3 @@
 from .enums import ExitCodes
 from .formatters import make_embed
+from .cache import TTLCache
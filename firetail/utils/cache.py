@@ -0,0 +1,61 @@
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TTLCache:
+    """A mapping whose entries expire `ttl` seconds after being set.
+
+    When `maxsize` is given the oldest entries are evicted first once
+    the cache is full. Expired entries are dropped when they're read,
+    and swept out once every `maxsize` evictions.
+    """
+
+    def __init__(self, ttl, maxsize=None, timer=time.monotonic):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._timer = timer
+        self._data = OrderedDict()
+        self._evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def get(self, key, default=None):
+        item = self._data.get(key)
+        if item is None:
+            return default
+        expires, value = item
+        if expires <= self._timer():
+            del self._data[key]
+            return default
+        return value
+
+    def set(self, key, value, ttl=None):
+        if key in self._data:
+            del self._data[key]
+        elif self.maxsize is not None and len(self._data) >= self.maxsize:
+            self._evictions += 1
+            if self._evictions >= self.maxsize:
+                self._evictions = 0
+                self.expire()
+            while len(self._data) >= self.maxsize:
+                self._data.popitem(last=False)
+        self._data[key] = (self._timer() + (self.ttl if ttl is None else ttl), value)
+
+    def pop(self, key, default=None):
+        item = self._data.pop(key, None)
+        return default if item is None else item[1]
+
+    def expire(self):
+        """Drop all expired entries."""
+        now = self._timer()
+        for key in [key for key, (expires, _) in self._data.items() if expires <= now]:
+            del self._data[key]
+
+    def clear(self):
+        self._data.clear()
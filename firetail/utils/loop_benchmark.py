@@ -0,0 +1,141 @@
+"""Event loop implementation benchmark.
+
+Run ``python -m firetail.utils.loop_benchmark`` to compare message
+dispatch, loopback request and killmail pipeline throughput on each
+installed event loop, to pick the ``event_loop`` setting for a host.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from firetail.extensions.killmail import benchmark as killmail_benchmark
+from firetail.extensions.killmail.objects import Subscription
+from firetail.utils.runtime import LOOPS, loop_policy
+
+
+async def dispatch(messages, listeners):
+    """Messages dispatched the way discord.py does, with a task per listener.
+
+    Each listener waits on two futures completed on later iterations of
+    the loop, standing in for looking up the context and replying.
+    """
+    loop = asyncio.get_event_loop()
+
+    async def listener(message):
+        for _ in range(2):
+            future = loop.create_future()
+            loop.call_soon(future.set_result, message)
+            await future
+
+    await asyncio.gather(*[loop.create_task(listener(i)) for i in range(messages) for _ in range(listeners)])
+    return messages
+
+
+async def loopback(requests, connections):
+    """Request and response round trips to a local server over TCP."""
+    async def handle(reader, writer):
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            writer.write(line)
+        writer.close()
+
+    async def client(count):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        for _ in range(count):
+            writer.write(b'ping\n')
+            await reader.readline()
+        writer.close()
+
+    server = await asyncio.start_server(handle, '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    per_connection = requests // connections
+    await asyncio.gather(*[client(per_connection) for _ in range(connections)])
+    server.close()
+    await server.wait_closed()
+    return per_connection * connections
+
+
+async def killmails(packages, subs, workers):
+    """Mails handed through a queue to workers parsing and matching them.
+
+    Each mail arrives on its own iteration of the loop, as it would
+    from RedisQ, so the loop schedules every hand off.
+    """
+    min_threshold = min((sub.threshold or 0 for sub in subs), default=0)
+    queue = asyncio.Queue()
+
+    async def worker():
+        while True:
+            package = await queue.get()
+            await killmail_benchmark.process(package, subs, min_threshold)
+            queue.task_done()
+
+    tasks = [asyncio.ensure_future(worker()) for _ in range(workers)]
+    for package in packages:
+        await asyncio.sleep(0)
+        queue.put_nowait(package)
+    await queue.join()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return len(packages)
+
+
+def best_of(repeat, func):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return count / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare throughput between event loop implementations.')
+    parser.add_argument('--messages', type=int, default=20000, help='messages to dispatch')
+    parser.add_argument('--listeners', type=int, default=3, help='listeners per message')
+    parser.add_argument('--requests', type=int, default=20000, help='loopback round trips')
+    parser.add_argument('--connections', type=int, default=20, help='concurrent loopback connections')
+    parser.add_argument('--mails', type=int, default=2000, help='number of synthetic mails')
+    parser.add_argument('--subs', type=int, default=200, help='number of subscriptions')
+    parser.add_argument('--workers', type=int, default=4, help='killmail workers')
+    parser.add_argument('--repeat', type=int, default=3, help='runs of each case, the best is shown')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    packages = killmail_benchmark.load_packages([
+        json.dumps({'package': killmail_benchmark.synthetic_package(rng, i, rng.randint(1, 100))}).encode()
+        for i in range(args.mails)
+    ])
+    subs = [
+        Subscription(i, None, rng.choice((None, 10000000, 100000000)), True, rng.randint(98000000, 98000500))
+        for i in range(args.subs)
+    ]
+
+    for name in LOOPS:
+        policy = loop_policy(name)
+        if policy is None:
+            print(f'{name}: not installed')
+            continue
+        asyncio.set_event_loop_policy(policy)
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        cases = (
+            ('dispatch', 'messages/s', lambda: loop.run_until_complete(dispatch(args.messages, args.listeners))),
+            ('loopback', 'requests/s', lambda: loop.run_until_complete(loopback(args.requests, args.connections))),
+            ('killmails', 'mails/s', lambda: loop.run_until_complete(killmails(packages, subs, args.workers))),
+        )
+        results = ', '.join(f'{case} {best_of(args.repeat, func):,.0f} {unit}' for case, unit, func in cases)
+        print(f'{name}: {results}')
+        loop.close()
+    asyncio.set_event_loop_policy(None)
+
+
+if __name__ == '__main__':
+    main()
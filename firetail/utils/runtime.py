@@ -0,0 +1,59 @@
+import asyncio
+import gc
+import logging
+
+log = logging.getLogger(__name__)
+
+LOOPS = ('asyncio', 'uvloop')
+
+
+def loop_policy(name):
+    """Event loop policy for a loop implementation, or None if it isn't installed."""
+    if name == 'asyncio':
+        return asyncio.DefaultEventLoopPolicy()
+    if name == 'uvloop':
+        try:
+            import uvloop
+        except ImportError:
+            return None
+        return uvloop.EventLoopPolicy()
+    raise ValueError(f"Unknown event loop {name}, expected one of {', '.join(LOOPS)}.")
+
+
+def install_loop(name):
+    """Create new event loops with the named implementation, falling back to asyncio.
+
+    Must be called before the bot is created, as it makes its loop on
+    creation, and nothing may make asyncio primitives before then. The
+    default policy is left alone for asyncio. Returns the name of the
+    implementation in use.
+    """
+    if name == 'asyncio':
+        return name
+    policy = loop_policy(name)
+    if policy is None:
+        log.warning(f'{name} is not installed, using the asyncio event loop.')
+        return 'asyncio'
+    asyncio.set_event_loop_policy(policy)
+    return name
+
+
+def tune_gc(threshold):
+    """Set the garbage collector's thresholds, from the youngest generation up.
+
+    A higher first threshold means fewer collections pausing the loop
+    while lots of short lived objects are made, such as when decoding
+    killmails, at the cost of some memory.
+    """
+    gc.set_threshold(*threshold)
+    log.info(f'Garbage collector thresholds set to {gc.get_threshold()}.')
+
+
+def set_debug(loop, enabled, slow_callback=0.1):
+    """Toggle asyncio debug mode on a loop.
+
+    Debug mode logs callbacks taking longer than `slow_callback` seconds
+    and coroutines that are never awaited, but slows everything down.
+    """
+    loop.set_debug(enabled)
+    loop.slow_callback_duration = slow_callback